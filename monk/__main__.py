@@ -1,26 +1,46 @@
+from functools import lru_cache
 from pathlib import Path
 from sys import argv
+from typing import cast
 
-from monk.evaluator import evaluate
+from monk.ast import Program
+from monk.compiler import Compiler, SymbolTable
 from monk.lexer import lex
-from monk.object import Environment
+from monk.object import Object
 from monk.parser import Parser
+from monk.transform import fold
+from monk.vm import VM
 
 
-def run(code: str, env: Environment) -> None:
+@lru_cache(maxsize=256)
+def parse(code: str) -> Program:
+    "Parse and fold `code`. Programs are cached, so resubmitting the same code skips parsing."
     lexer = lex(code)
     parser = Parser(lexer)
-    program = parser.parse_program()
-    result = evaluate(program, env)
+    return cast("Program", fold(parser.parse_program()))
+
+
+def run(
+    code: str,
+    symbols: SymbolTable,
+    constants: list[Object],
+    globals_: list[Object | None],
+) -> None:
+    program = parse(code)
+    compiler = Compiler(symbols, constants)
+    compiler.compile(program)
+    result = VM(compiler.bytecode(), globals_).run()
     print(result)
 
 
 if __name__ == "__main__":
-    env = Environment()
+    symbols = SymbolTable()
+    constants: list[Object] = []
+    globals_: list[Object | None] = []
 
     if len(argv) > 1:
         code = Path(argv[1]).read_text()
-        run(code, env)
+        run(code, symbols, constants, globals_)
     else:
         while True:
-            run(input(">>> "), env)
+            run(input(">>> "), symbols, constants, globals_)
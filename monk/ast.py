@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, override
 
 from monk.utils import join_commas
@@ -10,37 +9,62 @@ if TYPE_CHECKING:
     from monk.token import Token
 
 
-class Node(ABC):
-    @abstractmethod
-    def token_literal(self) -> str: ...
+class Node:
+    # Every node has slots, so the cached string needs one too. Literals are hash-consed through
+    # a `WeakValueDictionary` in `monk.transform`, hence `__weakref__`.
+    __slots__ = ("__weakref__", "_str")
+
+    def token_literal(self) -> str:
+        raise NotImplementedError
+
+    def _compute_str(self) -> str:
+        raise NotImplementedError
 
-    @abstractmethod
     @override
-    def __str__(self) -> str: ...
+    def __str__(self) -> str:
+        """
+        Render the node as source code.
+
+        The result is computed once and cached on the node, so nodes should not be mutated
+        after they have been stringified.
+        """
+
+        s: str | None = getattr(self, "_str", None)
+        if s is None:
+            s = self._compute_str()
+            # Nodes are frozen dataclasses, so bypass the frozen `__setattr__`
+            object.__setattr__(self, "_str", s)
+        return s
 
 
-class Statement(Node, ABC):
+class Statement(Node):
     """A node that does not produce any value."""
 
+    __slots__ = ()
+
 
-class Expression(Node, ABC):
+class Expression(Node):
     """A node that produces a value."""
 
+    __slots__ = ()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Program(Node):
     statements: list[Statement]
+    resolved: bool = field(default=False, init=False, repr=False, compare=False)
+    """Whether `monk.resolver` has annotated this program's identifiers."""
 
     @override
     def token_literal(self) -> str:
         return self.statements[0].token_literal()
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return "\n".join(str(s) for s in self.statements)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LetStatement(Statement):
     token: Token
     name: Identifier
@@ -51,11 +75,11 @@ class LetStatement(Statement):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"{self.token_literal()} {self.name.value} = {self.value};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReturnStatement(Statement):
     token: Token
     value: Expression
@@ -65,11 +89,11 @@ class ReturnStatement(Statement):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"{self.token_literal()} {self.value}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExpressionStatement(Statement):
     token: Token
     expression: Expression
@@ -79,11 +103,11 @@ class ExpressionStatement(Statement):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return str(self.expression) + ";"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BlockStatement(Statement):
     token: Token
     statements: list[Statement]
@@ -93,25 +117,34 @@ class BlockStatement(Statement):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"{{\n    {'\n    '.join(str(s) for s in self.statements)}\n}}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Identifier(Expression):
     token: Token
     value: str
+    depth: int = field(default=-1, init=False, repr=False, compare=False)
+    """How many functions outwards the name is bound, or -1 for globals. See `monk.resolver`."""
+    slot: int = field(default=-1, init=False, repr=False, compare=False)
+    """The index of the name in its function's slots."""
+    outer: tuple[tuple[int, int], ...] = field(default=(), init=False, repr=False, compare=False)
+    """
+    The `depth` and `slot` of the same name in enclosing functions, innermost first. They are
+    tried in order when the slot is unset, because the `let` that binds it has not run.
+    """
 
     @override
     def token_literal(self) -> str:
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IntegerLiteral(Expression):
     token: Token
     value: int
@@ -121,11 +154,11 @@ class IntegerLiteral(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return self.token.literal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BooleanLiteral(Expression):
     token: Token
     value: bool
@@ -135,11 +168,11 @@ class BooleanLiteral(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return self.token.literal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StringLiteral(Expression):
     token: Token
     value: str
@@ -149,11 +182,11 @@ class StringLiteral(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f'"{self.value}"'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArrayLiteral(Expression):
     token: Token
     values: list[Expression]
@@ -163,26 +196,28 @@ class ArrayLiteral(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
-        return f"[{join_commas([str(v) for v in self.values])}]"
+    def _compute_str(self) -> str:
+        return f"[{join_commas(self.values)}]"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FunctionLiteral(Expression):
     token: Token
     parameters: list[Identifier]
     body: BlockStatement
+    num_slots: int = field(default=0, init=False, repr=False, compare=False)
+    """The number of parameters and locals in the function. See `monk.resolver`."""
 
     @override
     def token_literal(self) -> str:
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"{self.token_literal}({join_commas(self.parameters)}) {self.body}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PrefixExpression(Expression):
     token: Token
     operator: str
@@ -193,11 +228,11 @@ class PrefixExpression(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"({self.operator}{self.right})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InfixExpression(Expression):
     token: Token
     left: Expression
@@ -209,11 +244,11 @@ class InfixExpression(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"({self.left} {self.operator} {self.right})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IfExpression(Expression):
     token: Token
     condition: Expression
@@ -225,7 +260,7 @@ class IfExpression(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         s = f"if {self.condition} {self.consequence}"
 
         if self.alternative is not None:
@@ -234,7 +269,7 @@ class IfExpression(Expression):
         return s
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CallExpression(Expression):
     token: Token
     function: Identifier | FunctionLiteral
@@ -245,5 +280,5 @@ class CallExpression(Expression):
         return self.token.literal
 
     @override
-    def __str__(self) -> str:
+    def _compute_str(self) -> str:
         return f"{self.function}({join_commas(self.arguments)})"
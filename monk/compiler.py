@@ -0,0 +1,649 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import TYPE_CHECKING, final
+
+from monk.ast import (
+    ArrayLiteral,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    ExpressionStatement,
+    FunctionLiteral,
+    Identifier,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+)
+from monk.evaluator import make_int
+from monk.object import CompiledFunction, Scalar, String
+
+if TYPE_CHECKING:
+    from monk.ast import Node, Statement
+    from monk.object import Object
+
+
+class Opcode(IntEnum):
+    LOAD_CONST = 0
+    LOAD_TRUE = 1
+    LOAD_FALSE = 2
+    LOAD_NULL = 3
+    LOAD_GLOBAL = 4
+    STORE_GLOBAL = 5
+    LOAD_LOCAL = 6
+    STORE_LOCAL = 7
+    LOAD_FREE = 8
+    POP = 9
+
+    # Locals captured by nested functions live in cells, which the closures share
+    MAKE_CELL = 10
+    LOAD_CELL = 11
+    LOAD_FREE_CELL = 12
+    LOAD_DEREF = 13
+    STORE_DEREF = 14
+
+    ADD = 15
+    SUB = 16
+    MUL = 17
+    DIV = 18
+    EQUAL = 19
+    NOT_EQUAL = 20
+    LESSER_THAN = 21
+    GREATER_THAN = 22
+    MINUS = 23
+    BANG = 24
+
+    JUMP = 25
+    JUMP_IF_FALSE = 26
+
+    BUILD_ARRAY = 27
+    MAKE_CLOSURE = 28
+    CALL = 29
+    RETURN = 30
+
+
+OPERAND_WIDTHS: dict[Opcode, tuple[int, ...]] = {
+    Opcode.LOAD_CONST: (2,),
+    Opcode.LOAD_GLOBAL: (2,),
+    Opcode.STORE_GLOBAL: (2,),
+    Opcode.LOAD_LOCAL: (1,),
+    Opcode.STORE_LOCAL: (1,),
+    Opcode.LOAD_FREE: (1,),
+    Opcode.MAKE_CELL: (1,),
+    Opcode.LOAD_CELL: (1,),
+    Opcode.LOAD_FREE_CELL: (1,),
+    Opcode.LOAD_DEREF: (1,),
+    Opcode.STORE_DEREF: (1,),
+    Opcode.JUMP: (2,),
+    Opcode.JUMP_IF_FALSE: (2,),
+    Opcode.BUILD_ARRAY: (2,),
+    Opcode.MAKE_CLOSURE: (2, 1),
+    Opcode.CALL: (1,),
+}
+"""Byte widths of each opcode's operands. Opcodes not listed take no operands."""
+
+_OPERAND_LIMITS: dict[Opcode, tuple[str, ...]] = {
+    Opcode.LOAD_CONST: ("Too many constants (at most 65536)",),
+    Opcode.LOAD_GLOBAL: ("Too many global variables (at most 65536)",),
+    Opcode.STORE_GLOBAL: ("Too many global variables (at most 65536)",),
+    Opcode.LOAD_LOCAL: ("Too many local variables in one function (at most 256)",),
+    Opcode.STORE_LOCAL: ("Too many local variables in one function (at most 256)",),
+    Opcode.LOAD_FREE: ("Too many captured variables in one function (at most 255)",),
+    Opcode.MAKE_CELL: ("Too many local variables in one function (at most 256)",),
+    Opcode.LOAD_CELL: ("Too many local variables in one function (at most 256)",),
+    Opcode.LOAD_FREE_CELL: ("Too many captured variables in one function (at most 255)",),
+    Opcode.LOAD_DEREF: ("Too many local variables in one function (at most 256)",),
+    Opcode.STORE_DEREF: ("Too many local variables in one function (at most 256)",),
+    Opcode.JUMP: ("Too much code in one function (at most 65535 bytes of bytecode)",),
+    Opcode.JUMP_IF_FALSE: ("Too much code in one function (at most 65535 bytes of bytecode)",),
+    Opcode.BUILD_ARRAY: ("Too many elements in one array literal (at most 65535)",),
+    Opcode.MAKE_CLOSURE: (
+        "Too many constants (at most 65536)",
+        "Too many captured variables in one function (at most 255)",
+    ),
+    Opcode.CALL: ("Too many arguments in one call (at most 255)",),
+}
+"""The error raised when an operand of each opcode does not fit in its width, by operand."""
+
+_STACK_EFFECTS: dict[Opcode, int] = {
+    Opcode.LOAD_CONST: 1,
+    Opcode.LOAD_TRUE: 1,
+    Opcode.LOAD_FALSE: 1,
+    Opcode.LOAD_NULL: 1,
+    Opcode.LOAD_GLOBAL: 1,
+    Opcode.STORE_GLOBAL: -1,
+    Opcode.LOAD_LOCAL: 1,
+    Opcode.STORE_LOCAL: -1,
+    Opcode.LOAD_FREE: 1,
+    Opcode.POP: -1,
+    Opcode.MAKE_CELL: 0,
+    Opcode.LOAD_CELL: 1,
+    Opcode.LOAD_FREE_CELL: 1,
+    Opcode.LOAD_DEREF: 1,
+    Opcode.STORE_DEREF: -1,
+    Opcode.ADD: -1,
+    Opcode.SUB: -1,
+    Opcode.MUL: -1,
+    Opcode.DIV: -1,
+    Opcode.EQUAL: -1,
+    Opcode.NOT_EQUAL: -1,
+    Opcode.LESSER_THAN: -1,
+    Opcode.GREATER_THAN: -1,
+    Opcode.MINUS: 0,
+    Opcode.BANG: 0,
+    Opcode.JUMP: 0,
+    Opcode.JUMP_IF_FALSE: -1,
+    Opcode.RETURN: -1,
+}
+"""
+How many values each opcode pushes minus how many it pops. Opcodes that take a variable number
+of values are handled by `stack_effect`.
+"""
+
+_INFIX_OPCODES: dict[str, Opcode] = {
+    "+": Opcode.ADD,
+    "-": Opcode.SUB,
+    "*": Opcode.MUL,
+    "/": Opcode.DIV,
+    "==": Opcode.EQUAL,
+    "!=": Opcode.NOT_EQUAL,
+    "<": Opcode.LESSER_THAN,
+    ">": Opcode.GREATER_THAN,
+}
+
+_PREFIX_OPCODES: dict[str, Opcode] = {
+    "-": Opcode.MINUS,
+    "!": Opcode.BANG,
+}
+
+
+def make(op: Opcode, *operands: int) -> bytes:
+    """
+    Encode a single instruction. Operands are stored big-endian.
+
+    A `SyntaxError` is raised if an operand does not fit in its width, which happens when the
+    program goes over one of the VM's limits.
+    """
+
+    instruction = bytearray([op])
+    widths = OPERAND_WIDTHS.get(op, ())
+    for i, (width, operand) in enumerate(zip(widths, operands, strict=True)):
+        if operand >= 1 << (8 * width):
+            raise SyntaxError(_OPERAND_LIMITS[op][i])
+        instruction += operand.to_bytes(width)
+    return bytes(instruction)
+
+
+def stack_effect(op: Opcode, *operands: int) -> int:
+    "How many values an instruction pushes onto the stack, minus how many it pops."
+    if op == Opcode.BUILD_ARRAY:
+        return 1 - operands[0]
+    if op == Opcode.MAKE_CLOSURE:
+        return 1 - operands[1]
+    if op == Opcode.CALL:
+        # The callee and its arguments are replaced by the result
+        return -operands[0]
+    return _STACK_EFFECTS[op]
+
+
+def disassemble(instructions: bytes) -> str:
+    "Render instructions in a human-readable form, one per line."
+    lines: list[str] = []
+    ip = 0
+
+    while ip < len(instructions):
+        op = Opcode(instructions[ip])
+        operands: list[str] = []
+        offset = ip + 1
+        for width in OPERAND_WIDTHS.get(op, ()):
+            operands.append(str(int.from_bytes(instructions[offset : offset + width])))
+            offset += width
+
+        lines.append(" ".join([f"{ip:04}", op.name, *operands]))
+        ip = offset
+
+    return "\n".join(lines)
+
+
+class SymbolScope(Enum):
+    GLOBAL = "GLOBAL"
+    LOCAL = "LOCAL"
+    FREE = "FREE"
+    CELL = "CELL"
+    """A local that nested functions capture, stored in a cell that their closures share."""
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    scope: SymbolScope
+    index: int
+
+
+@final
+class SymbolTable:
+    """
+    Maps names to storage locations, resolved at compile time.
+
+    - `outer`: The enclosing table, or `None` for the global table.
+    - `free_symbols`: Symbols from enclosing functions that this function captures.
+    """
+
+    _LOCAL_SCOPES = (SymbolScope.LOCAL, SymbolScope.CELL)
+
+    def __init__(self, outer: SymbolTable | None = None) -> None:
+        self.outer = outer
+        self.free_symbols: list[Symbol] = []
+        self.num_definitions = 0
+        self._store: dict[str, Symbol] = {}
+
+    def define(self, name: str, *, cell: bool = False) -> Symbol:
+        """
+        Define a name in this scope, reusing its slot if it is already defined here.
+
+        Locals are put in a cell if `cell` is set.
+        """
+
+        symbol = self._store.get(name)
+        if self.outer is None:
+            if symbol is not None and symbol.scope == SymbolScope.GLOBAL:
+                return symbol
+            scope = SymbolScope.GLOBAL
+        else:
+            if symbol is not None and symbol.scope in self._LOCAL_SCOPES:
+                return symbol
+            scope = SymbolScope.CELL if cell else SymbolScope.LOCAL
+
+        symbol = Symbol(name, scope, self.num_definitions)
+        self._store[name] = symbol
+        self.num_definitions += 1
+        return symbol
+
+    def capture_shadowed(self, name: str) -> None:
+        """
+        Capture the variable that a local of this scope shadows in an enclosing function, if any.
+
+        A local is only bound once its `let` has run, so until then the name still refers to the
+        variable further out.
+        """
+
+        if self.outer is None:
+            return
+        symbol = self.outer.resolve(name)
+        if symbol is not None and symbol.scope != SymbolScope.GLOBAL:
+            self.free_symbols.append(symbol)
+
+    def names(self) -> tuple[str, ...]:
+        "The names defined in this scope, by index."
+        names = [""] * self.num_definitions
+        for symbol in self._store.values():
+            if symbol.scope in (SymbolScope.GLOBAL, *self._LOCAL_SCOPES):
+                names[symbol.index] = symbol.name
+        return tuple(names)
+
+    def resolve(self, name: str) -> Symbol | None:
+        symbol = self._store.get(name)
+        if symbol is not None or self.outer is None:
+            return symbol
+
+        symbol = self.outer.resolve(name)
+        if symbol is None or symbol.scope == SymbolScope.GLOBAL:
+            return symbol
+
+        return self._define_free(symbol)
+
+    def _define_free(self, original: Symbol) -> Symbol:
+        self.free_symbols.append(original)
+        symbol = Symbol(original.name, SymbolScope.FREE, len(self.free_symbols) - 1)
+        self._store[original.name] = symbol
+        return symbol
+
+
+@dataclass(frozen=True)
+class Bytecode:
+    """
+    A compiled program.
+
+    - `max_stack`: How many values the main program needs on the stack at once.
+    - `global_names`: The name of each global, by index, for lookups and error messages.
+    """
+
+    instructions: bytes
+    constants: list[Object]
+    num_globals: int = 0
+    max_stack: int = 0
+    global_names: tuple[str, ...] = ()
+
+
+@dataclass
+class _Scope:
+    "The instructions of a function being compiled, and how deep its stack gets."
+
+    instructions: bytearray = field(default_factory=bytearray)
+    depth: int = 0
+    max_depth: int = 0
+
+
+@final
+class Compiler:
+    """
+    Lowers an AST into flat bytecode for `monk.vm.VM`.
+
+    Passing in an existing symbol table and constant pool lets consecutive compilations (as in
+    the REPL) share globals with each other. Equal integer and string constants share one entry
+    in the pool, so that repeating a literal does not grow it.
+
+    Names are bound when their `let` runs, as in the evaluator. Every `let` in a function body
+    gets its slot before the body is compiled, so code anywhere in the function (including
+    nested functions) can refer to it. Names that are not bound in any enclosing function are
+    globals, even if no `let` for them has been compiled yet. That includes the names of
+    builtins, so that a later `let` can still shadow them; the VM starts those globals out as
+    the builtin. Reading any other global that is still unset is a `NameError` at run time.
+    """
+
+    def __init__(
+        self,
+        symbol_table: SymbolTable | None = None,
+        constants: list[Object] | None = None,
+    ) -> None:
+        self.constants = constants if constants is not None else []
+        self._symbols = symbol_table if symbol_table is not None else SymbolTable()
+        self._globals = self._symbols
+        self._scopes = [_Scope()]
+        self._constant_indexes: dict[Object, int] = {
+            constant: i for i, constant in enumerate(self.constants) if isinstance(constant, Scalar)
+        }
+
+    def bytecode(self) -> Bytecode:
+        scope = self._scopes[-1]
+        return Bytecode(
+            bytes(scope.instructions),
+            self.constants,
+            self._symbols.num_definitions,
+            scope.max_depth,
+            self._symbols.names(),
+        )
+
+    @property
+    def _instructions(self) -> bytearray:
+        return self._scopes[-1].instructions
+
+    def compile(self, node: Node) -> None:  # noqa: C901, PLR0912
+        match node:
+            case Program():
+                self._compile_block(node.statements)
+                self._emit(Opcode.RETURN)
+
+            case BlockStatement():
+                self._compile_block(node.statements)
+
+            case ExpressionStatement():
+                self.compile(node.expression)
+                self._emit(Opcode.POP)
+
+            case LetStatement():
+                self._compile_let_statement(node)
+
+            case ReturnStatement():
+                self.compile(node.value)
+                self._emit(Opcode.RETURN)
+
+            case IntegerLiteral():
+                self._emit(Opcode.LOAD_CONST, self._add_constant(make_int(node.value)))
+
+            case StringLiteral():
+                self._emit(Opcode.LOAD_CONST, self._add_constant(String(node.value)))
+
+            case BooleanLiteral():
+                self._emit(Opcode.LOAD_TRUE if node.value else Opcode.LOAD_FALSE)
+
+            case ArrayLiteral():
+                for value in node.values:
+                    self.compile(value)
+                self._emit(Opcode.BUILD_ARRAY, len(node.values))
+
+            case Identifier():
+                self._load_symbol(node.value)
+
+            case PrefixExpression():
+                self.compile(node.right)
+                self._emit(_PREFIX_OPCODES[node.operator])
+
+            case InfixExpression():
+                self.compile(node.left)
+                self.compile(node.right)
+                self._emit(_INFIX_OPCODES[node.operator])
+
+            case IfExpression():
+                self._compile_if_expression(node)
+
+            case FunctionLiteral():
+                self._compile_function_literal(node)
+
+            case CallExpression():
+                self.compile(node.function)
+                for argument in node.arguments:
+                    self.compile(argument)
+                self._emit(Opcode.CALL, len(node.arguments))
+
+            case _:
+                msg = f"Cannot compile {type(node)}"
+                raise TypeError(msg)
+
+    def _compile_block(self, statements: list[Statement]) -> None:
+        """
+        Compile a list of statements, leaving the value of the last one on the stack.
+
+        Blocks that end in anything other than an expression produce `null`.
+        """
+
+        if not statements:
+            self._emit(Opcode.LOAD_NULL)
+            return
+
+        for statement in statements[:-1]:
+            self.compile(statement)
+
+        last = statements[-1]
+        if isinstance(last, ExpressionStatement):
+            self.compile(last.expression)
+        else:
+            self.compile(last)
+            self._emit(Opcode.LOAD_NULL)
+
+    def _compile_let_statement(self, node: LetStatement) -> None:
+        self.compile(node.value)
+
+        symbol = self._symbols.define(node.name.value)
+        match symbol.scope:
+            case SymbolScope.GLOBAL:
+                self._emit(Opcode.STORE_GLOBAL, symbol.index)
+            case SymbolScope.CELL:
+                self._emit(Opcode.STORE_DEREF, symbol.index)
+            case _:
+                self._emit(Opcode.STORE_LOCAL, symbol.index)
+
+    def _compile_if_expression(self, node: IfExpression) -> None:
+        self.compile(node.condition)
+        jump_if_false = self._emit(Opcode.JUMP_IF_FALSE, 0)
+        depth = self._scopes[-1].depth
+
+        self.compile(node.consequence)
+        jump = self._emit(Opcode.JUMP, 0)
+
+        # The alternative starts from the same stack as the consequence
+        self._scopes[-1].depth = depth
+        self._patch_jump(jump_if_false)
+        if node.alternative is not None:
+            self.compile(node.alternative)
+        else:
+            self._emit(Opcode.LOAD_NULL)
+
+        self._patch_jump(jump)
+
+    def _compile_function_literal(self, node: FunctionLiteral) -> None:
+        lets: dict[str, None] = {}
+        captured: set[str] = set()
+        _scan_function_body(node.body, lets, captured)
+
+        enclosing = self._symbols
+        self._scopes.append(_Scope())
+        self._symbols = SymbolTable(enclosing)
+
+        parameters = [param.value for param in node.parameters]
+        for name in dict.fromkeys([*parameters, *lets]):
+            symbol = self._symbols.define(name, cell=name in captured)
+            if symbol.scope == SymbolScope.CELL:
+                self._emit(Opcode.MAKE_CELL, symbol.index)
+        for name in lets:
+            if name not in parameters:
+                self._symbols.capture_shadowed(name)
+
+        self.compile(node.body)
+        self._emit(Opcode.RETURN)
+
+        free_symbols = self._symbols.free_symbols
+        num_locals = self._symbols.num_definitions
+        local_names = self._symbols.names()
+        scope = self._scopes.pop()
+        self._symbols = enclosing
+
+        for symbol in free_symbols:
+            self._load_cell(symbol)
+
+        function = CompiledFunction(
+            bytes(scope.instructions),
+            num_locals,
+            len(node.parameters),
+            scope.max_depth,
+            local_names,
+            tuple(symbol.name for symbol in free_symbols),
+            node,
+        )
+        self._emit(Opcode.MAKE_CLOSURE, self._add_constant(function), len(free_symbols))
+
+    def _load_symbol(self, name: str) -> None:
+        symbol = self._symbols.resolve(name)
+        if symbol is None:
+            # Not bound yet, so it is a global that a later `let` can bind
+            symbol = self._globals.define(name)
+        self._load(symbol)
+
+    def _load(self, symbol: Symbol) -> None:
+        match symbol.scope:
+            case SymbolScope.GLOBAL:
+                self._emit(Opcode.LOAD_GLOBAL, symbol.index)
+            case SymbolScope.LOCAL:
+                self._emit(Opcode.LOAD_LOCAL, symbol.index)
+            case SymbolScope.FREE:
+                self._emit(Opcode.LOAD_FREE, symbol.index)
+            case SymbolScope.CELL:
+                self._emit(Opcode.LOAD_DEREF, symbol.index)
+
+    def _load_cell(self, symbol: Symbol) -> None:
+        "Load the cell that holds `symbol`, rather than its value, for a closure to capture."
+        match symbol.scope:
+            case SymbolScope.CELL:
+                self._emit(Opcode.LOAD_CELL, symbol.index)
+            case SymbolScope.FREE:
+                self._emit(Opcode.LOAD_FREE_CELL, symbol.index)
+            case _:
+                msg = f"Cannot capture {symbol.scope} {symbol.name}"
+                raise TypeError(msg)
+
+    def _add_constant(self, obj: Object) -> int:
+        if isinstance(obj, Scalar):
+            index = self._constant_indexes.get(obj)
+            if index is None:
+                index = self._constant_indexes[obj] = len(self.constants)
+                self.constants.append(obj)
+            return index
+
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def _emit(self, op: Opcode, *operands: int) -> int:
+        "Append an instruction to the current scope and return its position."
+        scope = self._scopes[-1]
+        position = len(scope.instructions)
+        scope.instructions.extend(make(op, *operands))
+        scope.depth += stack_effect(op, *operands)
+        scope.max_depth = max(scope.max_depth, scope.depth)
+        return position
+
+    def _patch_jump(self, position: int) -> None:
+        "Point the jump at `position` to the end of the current instructions."
+        instructions = self._instructions
+        op = Opcode(instructions[position])
+        instructions[position + 1 : position + 3] = make(op, len(instructions))[1:]
+
+
+def _scan_function_body(  # noqa: C901, PLR0912
+    node: Node,
+    lets: dict[str, None],
+    captured: set[str],
+    *,
+    nested: bool = False,
+) -> None:
+    """
+    Collect the names bound with `let` directly in a function body into `lets`, in order, and
+    every name that appears in a function nested in it into `captured`.
+
+    Only locals in `captured` can be captured by a closure, so only those need a cell.
+    """
+
+    match node:
+        case BlockStatement():
+            for statement in node.statements:
+                _scan_function_body(statement, lets, captured, nested=nested)
+
+        case ExpressionStatement():
+            _scan_function_body(node.expression, lets, captured, nested=nested)
+
+        case ReturnStatement():
+            _scan_function_body(node.value, lets, captured, nested=nested)
+
+        case LetStatement():
+            if nested:
+                captured.add(node.name.value)
+            else:
+                lets[node.name.value] = None
+            _scan_function_body(node.value, lets, captured, nested=nested)
+
+        case Identifier():
+            if nested:
+                captured.add(node.value)
+
+        case ArrayLiteral():
+            for value in node.values:
+                _scan_function_body(value, lets, captured, nested=nested)
+
+        case PrefixExpression():
+            _scan_function_body(node.right, lets, captured, nested=nested)
+
+        case InfixExpression():
+            _scan_function_body(node.left, lets, captured, nested=nested)
+            _scan_function_body(node.right, lets, captured, nested=nested)
+
+        case IfExpression():
+            _scan_function_body(node.condition, lets, captured, nested=nested)
+            _scan_function_body(node.consequence, lets, captured, nested=nested)
+            if node.alternative is not None:
+                _scan_function_body(node.alternative, lets, captured, nested=nested)
+
+        case FunctionLiteral():
+            _scan_function_body(node.body, lets, captured, nested=True)
+
+        case CallExpression():
+            _scan_function_body(node.function, lets, captured, nested=nested)
+            for argument in node.arguments:
+                _scan_function_body(argument, lets, captured, nested=nested)
+
+        case _:
+            pass
@@ -1,3 +1,7 @@
+import sys
+from collections.abc import Callable
+from typing import Any, cast
+
 from monk.ast import (
     ArrayLiteral,
     BlockStatement,
@@ -23,32 +27,55 @@ from monk.object import (
     Boolean,
     Builtin,
     Environment,
+    Frame,
     Function,
     Integer,
     Null,
     Object,
-    ReturnValue,
     String,
 )
+from monk.resolver import GLOBAL_DEPTH, resolve
 
 NULL = Null()
 TRUE = Boolean(value=True)
 FALSE = Boolean(value=False)
 
+# Operators are interned by the lexer, so they can be compared by identity
+_PLUS = sys.intern("+")
+_MINUS = sys.intern("-")
+_ASTERISK = sys.intern("*")
+_SLASH = sys.intern("/")
+_LESSER_THAN = sys.intern("<")
+_GREATER_THAN = sys.intern(">")
+_EQUAL = sys.intern("==")
+_NOT_EQUAL = sys.intern("!=")
+_BANG = sys.intern("!")
+
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+_INT_CACHE = [Integer(i) for i in range(_SMALL_INT_MIN, _SMALL_INT_MAX + 1)]
+
+
+def make_int(value: int) -> Integer:
+    "Return an `Integer`, reusing a shared instance for small values like CPython does."
+    if _SMALL_INT_MIN <= value <= _SMALL_INT_MAX:
+        return _INT_CACHE[value - _SMALL_INT_MIN]
+    return Integer(value)
+
 
 def builtin_len(*args: Object) -> Object:
     if len(args) != 1:
         msg = f"len takes 1 argument, got {len(args)}"
         raise TypeError(msg)
 
-    if not isinstance(args[0], String | Array):
-        msg = f"len takes a string or an array, got {args[0].type}"
-        raise TypeError(msg)
-
-    if isinstance(args[0], String):
-        return Integer(len(args[0].value))
+    arg = args[0]
+    if type(arg) is String:
+        return make_int(len(arg.value))
+    if type(arg) is Array:
+        return make_int(arg.end - arg.start)
 
-    return Integer(len(args[0].values))
+    msg = f"len takes a string or an array, got {arg.type}"
+    raise TypeError(msg)
 
 
 def builtin_puts(*args: Object) -> Object:
@@ -60,7 +87,7 @@ def builtin_puts(*args: Object) -> Object:
 def builtin_input(*args: Object) -> Object:
     prompt = ""
     if len(args) == 1:
-        if not isinstance(args[0], String):
+        if type(args[0]) is not String:
             msg = f"Input prompt should be a string, got {args[0].type}"
             raise TypeError(msg)
         prompt = args[0].value
@@ -74,11 +101,15 @@ def builtin_first(*args: Object) -> Object:
         raise TypeError(msg)
 
     array = args[0]
-    if not isinstance(array, Array):
+    if type(array) is not Array:
         msg = f"first takes an array, got {array.type}"
         raise TypeError(msg)
 
-    return array.values[0]
+    if array.start == array.end:
+        msg = "first takes a non-empty array"
+        raise IndexError(msg)
+
+    return array.items[array.start]
 
 
 def builtin_last(*args: Object) -> Object:
@@ -87,11 +118,15 @@ def builtin_last(*args: Object) -> Object:
         raise TypeError(msg)
 
     array = args[0]
-    if not isinstance(array, Array):
+    if type(array) is not Array:
         msg = f"last takes an array, got {array.type}"
         raise TypeError(msg)
 
-    return array.values[-1]
+    if array.start == array.end:
+        msg = "last takes a non-empty array"
+        raise IndexError(msg)
+
+    return array.items[array.end - 1]
 
 
 def builtin_rest(*args: Object) -> Object:
@@ -100,11 +135,11 @@ def builtin_rest(*args: Object) -> Object:
         raise TypeError(msg)
 
     array = args[0]
-    if not isinstance(array, Array):
+    if type(array) is not Array:
         msg = f"rest takes an array, got {array.type}"
         raise TypeError(msg)
 
-    return Array(array.values[1:])
+    return array.rest()
 
 
 def builtin_push(*args: Object) -> Object:
@@ -115,12 +150,12 @@ def builtin_push(*args: Object) -> Object:
         raise TypeError(msg)
 
     array = args[0]
-    if not isinstance(array, Array):
+    if type(array) is not Array:
         msg = f"First argument to push takes an array, got {array.type}"
         raise TypeError(msg)
 
     obj = args[1]
-    array.values.append(obj)
+    array.append(obj)
 
     return array
 
@@ -136,95 +171,158 @@ builtins: dict[str, Builtin] = {
 }
 
 
-def evaluate(node: Node, env: Environment) -> Object:  # noqa: PLR0911, PLR0912, C901
-    match node:
-        case Program():
-            return evaluate_program(env, node.statements)
+def evaluate(node: Node, env: Environment) -> Object:
+    handler = _HANDLERS.get(type(node))
+    if handler is None:
+        msg = f"Cannot evaluate {type(node)}"
+        raise TypeError(msg)
+    return handler(node, env)
+
+
+def _eval_program(node: Program, env: Environment) -> Object:
+    if not node.resolved:
+        resolve(node)
+        object.__setattr__(node, "resolved", True)
+    return evaluate_program(env, node.statements)
+
 
-        case BlockStatement():
-            return evaluate_block_statement(env, node.statements)
+def _eval_block_statement(node: BlockStatement, env: Environment) -> Object:
+    return evaluate_block_statement(env, node.statements)
 
-        case ExpressionStatement():
-            return evaluate(node.expression, env)
 
-        case IntegerLiteral():
-            return Integer(node.value)
+def _eval_expression_statement(node: ExpressionStatement, env: Environment) -> Object:
+    return evaluate(node.expression, env)
 
-        case StringLiteral():
-            return String(node.value)
 
-        case ArrayLiteral():
-            return Array([evaluate(value, env) for value in node.values])
+def _eval_integer_literal(node: IntegerLiteral, _env: Environment) -> Object:
+    return make_int(node.value)
 
-        case Identifier():
-            if v := env.get(node.value):
+
+def _eval_string_literal(node: StringLiteral, _env: Environment) -> Object:
+    return String(node.value)
+
+
+def _eval_array_literal(node: ArrayLiteral, env: Environment) -> Object:
+    return Array([evaluate(value, env) for value in node.values])
+
+
+def _eval_identifier(node: Identifier, env: Environment) -> Object:
+    if node.depth != GLOBAL_DEPTH:
+        if (v := env.frames[node.depth][node.slot]) is not None:
+            return v
+
+        # The `let` binding this name has not run, so it does not shadow anything yet
+        for depth, slot in node.outer:
+            if (v := env.frames[depth][slot]) is not None:
                 return v
 
-            if builtin := builtins.get(node.value):
-                return builtin
+    if v := env.globals.get(node.value):
+        return v
 
-            msg = f"Unknown identifier {node.value}"
-            raise NameError(msg)
+    if builtin := builtins.get(node.value):
+        return builtin
 
-        case BooleanLiteral():
-            return TRUE if node.value else FALSE
+    msg = f"Unknown identifier {node.value}"
+    raise NameError(msg)
 
-        case PrefixExpression():
-            right = evaluate(node.right, env)
-            return evaluate_prefix_expression(node.operator, right)
 
-        case InfixExpression():
-            left = evaluate(node.left, env)
-            right = evaluate(node.right, env)
-            return evaluate_infix_expression(node.operator, left, right)
+def _eval_boolean_literal(node: BooleanLiteral, _env: Environment) -> Object:
+    return TRUE if node.value else FALSE
 
-        case IfExpression():
-            if is_truthy(evaluate(node.condition, env)):
-                return evaluate(node.consequence, env)
-            if node.alternative is not None:
-                return evaluate(node.alternative, env)
-            return NULL
 
-        case FunctionLiteral():
-            return Function(node.parameters, node.body, env)
+def _eval_prefix_expression(node: PrefixExpression, env: Environment) -> Object:
+    right = evaluate(node.right, env)
+    return evaluate_prefix_expression(node.operator, right)
 
-        case CallExpression():
-            function = evaluate(node.function, env)
-            args = evaluate_expressions(node.arguments, env)
 
-            match function:
-                case Builtin():
-                    return function.function(*args)
+def _eval_infix_expression(node: InfixExpression, env: Environment) -> Object:
+    left = evaluate(node.left, env)
+    right = evaluate(node.right, env)
+    return evaluate_infix_expression(node.operator, left, right)
 
-                case Function():
-                    scope_env = Environment(function.environment)
-                    for i, param in enumerate(function.parameters):
-                        scope_env[param.value] = args[i]
 
-                    result = evaluate(function.body, scope_env)
-                    if isinstance(result, ReturnValue):
-                        return result.value
-                    return result
+def _eval_if_expression(node: IfExpression, env: Environment) -> Object:
+    if is_truthy(evaluate(node.condition, env)):
+        return evaluate(node.consequence, env)
+    if node.alternative is not None:
+        return evaluate(node.alternative, env)
+    return NULL
 
-                case _:
-                    msg = f"Cannot call {function.type}"
-                    raise TypeError(msg)
 
-        case LetStatement():
-            val = evaluate(node.value, env)
-            env[node.name.value] = val
-            return NULL
+def _eval_function_literal(node: FunctionLiteral, env: Environment) -> Object:
+    return Function(node, env)
 
-        case ReturnStatement():
-            return ReturnValue(evaluate(node.value, env))
 
-        case _:
-            msg = f"Cannot evaluate {type(node)}"
-            raise TypeError(msg)
+def _eval_call_expression(node: CallExpression, env: Environment) -> Object:
+    function = evaluate(node.function, env)
+
+    # Arguments are evaluated straight into what becomes the callee's frame
+    frame: Frame = [_HANDLERS[type(argument)](argument, env) for argument in node.arguments]
+
+    if type(function) is Function:
+        literal = function.literal
+        num_params = len(literal.parameters)
+        if len(frame) != num_params:
+            if len(frame) < num_params:
+                msg = "list index out of range"
+                raise IndexError(msg)
+            # Extra arguments are ignored
+            del frame[num_params:]
+
+        # Leave room for the function's locals after its parameters
+        if literal.num_slots > num_params:
+            frame.extend([None] * (literal.num_slots - num_params))
+
+        closure = function.environment
+        scope_env = Environment(closure.globals, (frame, *closure.frames))
+
+        return evaluate(literal.body, scope_env)
+
+    if type(function) is Builtin:
+        return function.function(*cast("list[Object]", frame))
+
+    msg = f"Cannot call {function.type}"
+    raise TypeError(msg)
+
+
+def _eval_let_statement(node: LetStatement, env: Environment) -> Object:
+    val = evaluate(node.value, env)
+    if node.name.depth == GLOBAL_DEPTH:
+        env.globals[node.name.value] = val
+    else:
+        env.frames[0][node.name.slot] = val
+    return NULL
+
+
+def _eval_return_statement(node: ReturnStatement, env: Environment) -> Object:
+    value = evaluate(node.value, env)
+    env.returning = True
+    return value
+
+
+_HANDLERS: dict[type[Node], Callable[[Any, Environment], Object]] = {
+    Program: _eval_program,
+    BlockStatement: _eval_block_statement,
+    ExpressionStatement: _eval_expression_statement,
+    IntegerLiteral: _eval_integer_literal,
+    StringLiteral: _eval_string_literal,
+    ArrayLiteral: _eval_array_literal,
+    Identifier: _eval_identifier,
+    BooleanLiteral: _eval_boolean_literal,
+    PrefixExpression: _eval_prefix_expression,
+    InfixExpression: _eval_infix_expression,
+    IfExpression: _eval_if_expression,
+    FunctionLiteral: _eval_function_literal,
+    CallExpression: _eval_call_expression,
+    LetStatement: _eval_let_statement,
+    ReturnStatement: _eval_return_statement,
+}
+"""Evaluation handlers keyed by the exact AST node type."""
 
 
 def is_truthy(obj: Object) -> bool:
-    return obj not in (NULL, FALSE)
+    # Booleans and null are only ever created as the singletons above
+    return obj is not FALSE and obj is not NULL
 
 
 def evaluate_expressions(expressions: list[Expression], env: Environment) -> list[Object]:
@@ -232,96 +330,86 @@ def evaluate_expressions(expressions: list[Expression], env: Environment) -> lis
 
 
 def evaluate_prefix_expression(operator: str, right: Object) -> Object:
-    match operator:
-        case "!":
-            return evaluate_bang_expression(right)
-        case "-" if isinstance(right, Integer):
-            return evaluate_integer_minus_expression(right)
-        case _:
-            msg = f"Unknown operator: {operator}{right.type}"
-            raise SyntaxError(msg)
+    if operator is _BANG:
+        return evaluate_bang_expression(right)
+    if operator is _MINUS and type(right) is Integer:
+        return evaluate_integer_minus_expression(right)
+
+    # Operators that did not come from the lexer might not be interned yet
+    interned = sys.intern(operator)
+    if interned is not operator:
+        return evaluate_prefix_expression(interned, right)
+
+    msg = f"Unknown operator: {operator}{right.type}"
+    raise SyntaxError(msg)
 
 
 def evaluate_bang_expression(right: Object) -> Object:
-    if right in (FALSE, NULL):
-        return TRUE
-    return FALSE
+    return TRUE if right is FALSE or right is NULL else FALSE
 
 
 def evaluate_integer_minus_expression(right: Integer) -> Object:
-    return Integer(-right.value)
+    return make_int(-right.value)
 
 
 def evaluate_infix_expression(operator: str, left: Object, right: Object) -> Object:
+    operation = _INFIX.get((type(left), type(right), operator))
+    if operation is not None:
+        return operation(left, right)
+
     if left.type != right.type:
         msg = f"Type mismatch: {left.type} {operator} {right.type}"
         raise TypeError(msg)
 
-    lhs = getattr(left, "value", None)
-    rhs = getattr(right, "value", None)
-
-    if not isinstance(lhs, int | bool | str) or not isinstance(rhs, int | bool | str):
+    if not isinstance(left, Integer | Boolean | String):
         msg = "Infix expression values must be integers, booleans, or strings"
         raise TypeError(msg)
 
-    if operator == "==":
-        return Boolean(lhs == rhs)
-    if operator == "!=":
-        return Boolean(lhs != rhs)
-
-    if operator == "+" and isinstance(lhs, str) and isinstance(rhs, str):
-        return String(lhs + rhs)
-
-    if isinstance(left, Integer) and isinstance(right, Integer):
-        return evaluate_integer_infix_expression(operator, left, right)
-
     msg = f"Unknown operator: {left.type} {operator} {right.type}"
     raise SyntaxError(msg)
 
 
-def evaluate_integer_infix_expression(operator: str, left: Integer, right: Integer) -> Object:
-    lhs = left.value
-    rhs = right.value
-    obj = NULL
-
-    match operator:
-        case "+":
-            obj = Integer(lhs + rhs)
-        case "-":
-            obj = Integer(lhs - rhs)
-        case "*":
-            obj = Integer(lhs * rhs)
-        case "/":
-            obj = Integer(lhs // rhs)
-        case ">":
-            obj = Boolean(lhs > rhs)
-        case "<":
-            obj = Boolean(lhs < rhs)
-        case _:
-            obj = NULL
-
-    return obj
+_INFIX: dict[tuple[type[Object], type[Object], str], Callable[[Any, Any], Object]] = {
+    (Integer, Integer, _PLUS): lambda left, right: make_int(left.value + right.value),
+    (Integer, Integer, _MINUS): lambda left, right: make_int(left.value - right.value),
+    (Integer, Integer, _ASTERISK): lambda left, right: make_int(left.value * right.value),
+    (Integer, Integer, _SLASH): lambda left, right: make_int(left.value // right.value),
+    (Integer, Integer, _LESSER_THAN): lambda left, right: (
+        TRUE if left.value < right.value else FALSE
+    ),
+    (Integer, Integer, _GREATER_THAN): lambda left, right: (
+        TRUE if left.value > right.value else FALSE
+    ),
+    (Integer, Integer, _EQUAL): lambda left, right: TRUE if left.value == right.value else FALSE,
+    (Integer, Integer, _NOT_EQUAL): lambda left, right: (
+        TRUE if left.value != right.value else FALSE
+    ),
+    (String, String, _PLUS): lambda left, right: String(left.value + right.value),
+    (String, String, _EQUAL): lambda left, right: TRUE if left.value == right.value else FALSE,
+    (String, String, _NOT_EQUAL): lambda left, right: TRUE if left.value != right.value else FALSE,
+    (Boolean, Boolean, _EQUAL): lambda left, right: TRUE if left.value == right.value else FALSE,
+    (Boolean, Boolean, _NOT_EQUAL): lambda left, right: (
+        TRUE if left.value != right.value else FALSE
+    ),
+}
+"""Infix operations keyed by the exact operand types and the operator."""
 
 
 def evaluate_program(env: Environment, statements: list[Statement]) -> Object:
-    result = Null()
-
-    for statement in statements:
-        result = evaluate(statement, env)
-
-        if isinstance(result, ReturnValue):
-            return result.value
-
+    result = evaluate_block_statement(env, statements)
+    # Let the environment be reused, as in the REPL
+    env.returning = False
     return result
 
 
 def evaluate_block_statement(env: Environment, statements: list[Statement]) -> Object:
-    result = Null()
+    result: Object = NULL
 
+    # Statements always have a handler, so skip the extra call through `evaluate`
     for statement in statements:
-        result = evaluate(statement, env)
+        result = _HANDLERS[type(statement)](statement, env)
 
-        if isinstance(result, ReturnValue):
-            return result
+        if env.returning:
+            break
 
     return result
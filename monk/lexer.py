@@ -1,78 +1,84 @@
 from __future__ import annotations
 
 import re
+import sys
 from typing import TYPE_CHECKING
 
-from monk.token import Token, TokenType
+from monk.token import KEYWORDS, OPERATORS, Token, TokenType
 
 if TYPE_CHECKING:
     from collections.abc import Generator
 
-PATTERNS = {
-    TokenType.LET: r"\blet\b",
-    TokenType.FUNCTION: r"\bfn\b",
-    TokenType.IF: r"\bif\b",
-    TokenType.ELSE: r"\belse\b",
-    TokenType.RETURN: r"\breturn\b",
-    TokenType.TRUE: r"\btrue\b",
-    TokenType.FALSE: r"\bfalse\b",
-    TokenType.IDENTIFIER: r"[a-zA-Z_][a-zA-Z0-9_]*",
-    TokenType.INTEGER: r"\d+",
-    TokenType.STRING: r'"[^"]*"',
-    TokenType.NOT_EQUAL: r"!=",
-    TokenType.BANG: r"!",
-    TokenType.EQUAL: r"==",
-    TokenType.ASSIGN: r"=",
-    TokenType.PLUS: r"\+",
-    TokenType.MINUS: r"-",
-    TokenType.ASTERISK: r"\*",
-    TokenType.SLASH: r"/",
-    TokenType.LESSER_THAN: r"<",
-    TokenType.GREATER_THAN: r">",
-    TokenType.LEFT_PAREN: r"\(",
-    TokenType.RIGHT_PAREN: r"\)",
-    TokenType.LEFT_BRACE: r"\{",
-    TokenType.RIGHT_BRACE: r"\}",
-    TokenType.LEFT_BRACKET: r"\[",
-    TokenType.RIGHT_BRACKET: r"\]",
-    TokenType.COMMA: r",",
-    TokenType.SEMICOLON: r";",
+# Operator tokens carry no information beyond their type, so each one is shared between all
+# of its occurrences. Their literals are interned so that operators can be compared by identity.
+_OPERATORS = {
+    literal: Token(token_type.value, sys.intern(literal))
+    for literal, token_type in OPERATORS.items()
 }
 
+# Keywords are shared in the same way
+_KEYWORDS = {literal: Token(token_type.value, literal) for literal, token_type in KEYWORDS.items()}
 
-def lex(code: str) -> Generator[Token]:
-    cursor = 0
+_END_OF_FILE = Token(TokenType.END_OF_FILE.value, "")
 
-    while cursor < len(code):
-        current_char = code[cursor]
+# Token types of tokens that are created while lexing, as plain ints (see `Token`)
+_IDENTIFIER_TYPE = TokenType.IDENTIFIER.value
+_INTEGER_TYPE = TokenType.INTEGER.value
+_STRING_TYPE = TokenType.STRING.value
 
-        # Skip whitespace
-        if current_char.isspace():
-            cursor += 1
-            continue
+# All tokens are matched by a single regex, so scanning happens inside the regex engine rather
+# than by trying one pattern at a time. Leading whitespace is consumed as part of each match, so
+# it never reaches the loop in `lex`. Alternatives are tried in order, so the most common tokens
+# (operators, then identifiers) come first. Two-character operators come before their
+# one-character prefixes so that they win. `END` matches trailing whitespace up to the end of the
+# input in one go; without it, a run of trailing whitespace would be rescanned from each of its
+# characters, which is quadratic.
+_MASTER = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<OPERATOR>==|!=|[=+\-*/!<>(){}\[\],;])
+        | (?P<IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_]*)
+        | (?P<INTEGER>\d+)
+        | "(?P<STRING>[^"]*)"
+        | (?P<ILLEGAL>\S)
+        | (?P<END>\Z)
+    )
+    """,
+    re.VERBOSE,
+)
 
-        token = None
 
-        for token_type, pattern in PATTERNS.items():
-            regex = re.compile(pattern)
-            match = regex.match(code, cursor)
-            if match:
-                literal = match.group()
+# Group numbers, so that matches can be dispatched on `lastindex` without comparing group names
+_IDENTIFIER = _MASTER.groupindex["IDENTIFIER"]
+_INTEGER = _MASTER.groupindex["INTEGER"]
+_STRING = _MASTER.groupindex["STRING"]
+_OPERATOR = _MASTER.groupindex["OPERATOR"]
+_END = _MASTER.groupindex["END"]
 
-                # Remove quotes around strings
-                if token_type == TokenType.STRING:
-                    literal = literal[1:-1]
 
-                token = Token(token_type, literal)
-                cursor = match.end()
-                break
+def lex(code: str) -> Generator[Token]:
+    for match in _MASTER.finditer(code):
+        group = match.lastindex
 
-        # If none of the patterns matched, this character is unsupported/illegal
-        if token is None:
-            msg = f"Illegal character: {current_char}"
+        # Ordered by how common each kind of token is
+        if group == _OPERATOR:
+            yield _OPERATORS[match.group(group)]
+        elif group == _IDENTIFIER:
+            literal = match.group(group)
+            token = _KEYWORDS.get(literal)
+            # Names are interned, so that looking them up by name mostly compares pointers
+            yield token if token is not None else Token(_IDENTIFIER_TYPE, sys.intern(literal))
+        elif group == _INTEGER:
+            yield Token(_INTEGER_TYPE, match.group(group))
+        elif group == _STRING:
+            yield Token(_STRING_TYPE, match.group(group))
+        elif group == _END:
+            break
+        else:
+            # If none of the patterns matched, this character is unsupported/illegal
+            msg = f"Illegal character: {match.group(group or 0)}"
             raise SyntaxError(msg)
 
-        yield token
-
     while True:
-        yield Token(TokenType.END_OF_FILE, "")
+        yield _END_OF_FILE
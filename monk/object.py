@@ -1,155 +1,286 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, Protocol, override
+from itertools import islice
+from typing import TYPE_CHECKING, ClassVar, Protocol, final, override
 
 from monk.utils import join_commas
 
 if TYPE_CHECKING:
-    from monk.ast import BlockStatement, Identifier
+    from monk.ast import BlockStatement, FunctionLiteral, Identifier
 
 
 class ObjectType(Enum):
+    """
+    Names of object types, used in error messages.
+
+    Code that dispatches on objects checks `type(obj) is ...` instead, which is a single pointer
+    comparison.
+    """
+
     INTEGER = "INTEGER"
     BOOLEAN = "BOOLEAN"
     NULL = "NULL"
-    RETURN_VALUE = "RETURN_VALUE"
     FUNCTION = "FUNCTION"
     STRING = "STRING"
     ARRAY = "ARRAY"
     BUILTIN = "BUILTIN"
+    COMPILED_FUNCTION = "COMPILED_FUNCTION"
+    CLOSURE = "CLOSURE"
 
     @override
     def __str__(self) -> str:
         return self.value
 
 
-class Object(ABC):
-    @property
-    @abstractmethod
-    def type(self) -> ObjectType: ...
+class Object:
+    __slots__ = ()
+
+    type: ClassVar[ObjectType]
 
-    @abstractmethod
     @override
-    def __str__(self) -> str: ...
+    def __str__(self) -> str:
+        raise NotImplementedError
 
 
-@dataclass(frozen=True)
-class Integer(Object):
-    value: int
+class Scalar[T](Object):
+    """
+    An object that wraps a single immutable Python value.
+
+    These are created on every arithmetic operation and string concatenation. They are plain
+    slotted classes rather than frozen dataclasses, whose `__init__` has to go through
+    `object.__setattr__`. They should still be treated as immutable.
+    """
+
+    __slots__ = ("value",)
+    __match_args__ = ("value",)
+
+    def __init__(self, value: T) -> None:
+        self.value = value
 
-    @property
     @override
-    def type(self) -> ObjectType:
-        return ObjectType.INTEGER
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and other.value == self.value
 
     @override
-    def __str__(self) -> str:
-        return str(self.value)
+    def __hash__(self) -> int:
+        return hash(self.value)
 
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(value={self.value!r})"
 
-@dataclass(frozen=True)
-class Boolean(Object):
-    value: bool
 
-    @property
+@final
+class Integer(Scalar[int]):
+    __slots__ = ()
+    type = ObjectType.INTEGER
+
     @override
-    def type(self) -> ObjectType:
-        return ObjectType.BOOLEAN
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+@final
+class Boolean(Scalar[bool]):
+    __slots__ = ()
+    type = ObjectType.BOOLEAN
 
     @override
     def __str__(self) -> str:
         return str(self.value).lower()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Null(Object):
-    @property
-    @override
-    def type(self) -> ObjectType:
-        return ObjectType.NULL
+    type = ObjectType.NULL
 
     @override
     def __str__(self) -> str:
         return "null"
 
 
-@dataclass(frozen=True)
-class ReturnValue(Object):
-    value: Object
-
-    @property
-    @override
-    def type(self) -> ObjectType:
-        return ObjectType.RETURN_VALUE
+@dataclass(frozen=True, slots=True)
+class Function(Object):
+    """
+    A function literal closed over the environment it was evaluated in.
 
-    @override
-    def __str__(self) -> str:
-        return str(self.value)
+    Everything but the environment is shared with the literal, so creating a closure only
+    stores two references.
+    """
 
+    type = ObjectType.FUNCTION
 
-@dataclass(frozen=True)
-class Function(Object):
-    parameters: list[Identifier]
-    body: BlockStatement
+    literal: FunctionLiteral
     environment: Environment
 
     @property
-    @override
-    def type(self) -> ObjectType:
-        return ObjectType.FUNCTION
+    def parameters(self) -> list[Identifier]:
+        return self.literal.parameters
+
+    @property
+    def body(self) -> BlockStatement:
+        return self.literal.body
+
+    @property
+    def num_slots(self) -> int:
+        return self.literal.num_slots
 
     @override
     def __str__(self) -> str:
         return f"fn({join_commas(self.parameters)}) {self.body}"
 
 
-@dataclass(frozen=True)
-class String(Object):
-    value: str
-
-    @property
-    @override
-    def type(self) -> ObjectType:
-        return ObjectType.STRING
+@final
+class String(Scalar[str]):
+    __slots__ = ()
+    type = ObjectType.STRING
 
     @override
     def __str__(self) -> str:
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Array(Object):
-    values: list[Object]
+    """
+    An array of objects.
+
+    - `items`: The backing list, which may be shared with other arrays.
+    - `start`: Index of the first element in `items`.
+    - `stop`: Index after the last element in `items`, or `None` to run to the end.
+
+    `rest` returns a view over the same backing list instead of copying it. A view is copied
+    before it is appended to, so appending never shows up in another array.
+    """
+
+    type = ObjectType.ARRAY
+
+    items: list[Object]
+    start: int = 0
+    stop: int | None = None
 
     @property
-    @override
-    def type(self) -> ObjectType:
-        return ObjectType.ARRAY
+    def values(self) -> list[Object]:
+        "The elements of the array. Copied for views, so avoid it on hot paths."
+        if self.start == 0 and self.stop is None:
+            return self.items
+        return self.items[self.start : self.stop]
+
+    @property
+    def end(self) -> int:
+        return len(self.items) if self.stop is None else self.stop
+
+    def rest(self) -> Array:
+        end = self.end
+        return Array(self.items, min(self.start + 1, end), end)
+
+    def append(self, obj: Object) -> None:
+        if self.start != 0 or self.stop is not None:
+            # Stop sharing the backing list before changing it
+            object.__setattr__(self, "items", self.values)
+            object.__setattr__(self, "start", 0)
+            object.__setattr__(self, "stop", None)
+        self.items.append(obj)
 
     @override
     def __str__(self) -> str:
-        return f"[{join_commas([str(v) for v in self.values])}]"
+        return f"[{join_commas(islice(self.items, self.start, self.stop))}]"
 
 
 class BuiltinFunction(Protocol):
     def __call__(self, *args: Object) -> Object: ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Builtin(Object):
+    type = ObjectType.BUILTIN
+
     function: BuiltinFunction
 
-    @property
     @override
-    def type(self) -> ObjectType:
-        return ObjectType.BUILTIN
+    def __str__(self) -> str:
+        return "builtin function"
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledFunction(Object):
+    """
+    The bytecode of a function body.
+
+    - `max_stack`: How many values the body needs on the stack at once, above its locals.
+    - `local_names`: The name of each local, by slot.
+    - `free_names`: The name of each variable captured from enclosing functions, by index.
+    - `literal`: The function literal it was compiled from, kept for printing. It is `None` for
+      the main program.
+    """
+
+    type = ObjectType.COMPILED_FUNCTION
+
+    instructions: bytes
+    num_locals: int = 0
+    num_parameters: int = 0
+    max_stack: int = 0
+    local_names: tuple[str, ...] = ()
+    free_names: tuple[str, ...] = ()
+    literal: FunctionLiteral | None = field(default=None, repr=False, compare=False)
 
     @override
     def __str__(self) -> str:
-        return "builtin function"
+        if self.literal is None:
+            return "compiled function"
+        return f"fn({join_commas(self.literal.parameters)}) {self.literal.body}"
+
+
+@final
+class Cell:
+    """
+    Holds a local that nested functions capture, so that they see later changes to it.
+
+    `value` is `None` until the local is bound.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Object | None = None) -> None:
+        self.value = value
+
+
+@dataclass(frozen=True, slots=True)
+class Closure(Object):
+    type = ObjectType.CLOSURE
+
+    function: CompiledFunction
+    free: list[Cell]
+
+    @override
+    def __str__(self) -> str:
+        return str(self.function)
+
+
+Frame = list[Object | None]
+"""The parameters and locals of one function call, indexed by the slots from `monk.resolver`."""
+
+
+@final
+class Environment:
+    """
+    The variables visible to a function call, or to the top level.
+
+    - `frames`: The frame of the current call, followed by the frames of each enclosing
+      function. An identifier at depth `d` and slot `s` lives in `frames[d][s]`.
+    - `globals`: Top-level variables by name, shared by every environment of a program.
+    - `returning`: Set by a `return` statement, so that enclosing blocks stop evaluating.
+    """
 
+    __slots__ = ("frames", "globals", "returning")
 
-Environment = dict[str, Object]
+    def __init__(
+        self,
+        globals_: dict[str, Object] | None = None,
+        frames: tuple[Frame, ...] = (),
+    ) -> None:
+        self.globals = globals_ if globals_ is not None else {}
+        self.frames = frames
+        self.returning = False
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Callable, Generator
 from enum import IntEnum
-from typing import final
+from typing import ClassVar, NoReturn, cast, final
 
 from monk.ast import (
     ArrayLiteral,
@@ -36,69 +36,61 @@ class Precedence(IntEnum):
     CALL = 7
 
 
-_PRECEDENCES: dict[TokenType, Precedence] = {
-    TokenType.EQUAL: Precedence.EQUALS,
-    TokenType.NOT_EQUAL: Precedence.EQUALS,
-    TokenType.LESSER_THAN: Precedence.LESSGREATER,
-    TokenType.GREATER_THAN: Precedence.LESSGREATER,
-    TokenType.PLUS: Precedence.SUM,
-    TokenType.MINUS: Precedence.SUM,
-    TokenType.SLASH: Precedence.PRODUCT,
-    TokenType.ASTERISK: Precedence.PRODUCT,
-    TokenType.LEFT_PAREN: Precedence.CALL,
-}
-
-
-@final
-class TokenIterator:
-    """
-    Abstracts iteration over a lexer.
-
-    - `current`: The current token.
-    - `next`: The next token (a.k.a. "peek token").
-    """
-
-    def __init__(self, lexer: Generator[Token]) -> None:
-        self._lexer = lexer
-
-        self.current = Token(TokenType.ILLEGAL, "")
-        self.next = Token(TokenType.ILLEGAL, "")
-
-        self.advance()  # Populate next token
-        self.advance()  # Populate current token
-
-    def advance(self) -> None:
-        "Advance by one token."
-        self.current = self.next
-        self.next = next(self._lexer)
-
-    def current_is(self, t: TokenType) -> bool:
-        "Return whether the current token is of the given type."
-        return self.current.type == t
-
-    def next_is(self, t: TokenType) -> bool:
-        "Return whether the next token is of the given type."
-        return self.next.type == t
-
-    def expect_next(self, t: TokenType) -> None:
-        """
-        Expect the next token to be of the given type.
-
-        If it is, the iterator will be advanced.
-        If it is not, a `SyntaxError` will be raised.
-        """
+def _by_token_type[T](entries: dict[TokenType, T], default: T) -> list[T]:
+    "Flatten `entries` into a list indexed by token type, so that lookups skip hashing."
+    table = [default] * (max(TokenType) + 1)
+    for token_type, entry in entries.items():
+        table[token_type] = entry
+    return table
+
+
+# Token types checked in the parsing loops, so that each check is a global load rather than an
+# attribute lookup on `TokenType`. They are plain ints, like the types of the tokens themselves.
+_SEMICOLON = TokenType.SEMICOLON.value
+_COMMA = TokenType.COMMA.value
+_RIGHT_BRACE = TokenType.RIGHT_BRACE.value
+_END_OF_FILE = TokenType.END_OF_FILE.value
+_LET = TokenType.LET.value
+_RETURN = TokenType.RETURN.value
+_ELSE = TokenType.ELSE.value
+_TRUE = TokenType.TRUE.value
+
+_BLOCK_END = (_RIGHT_BRACE, _END_OF_FILE)
+"""Token types that end a block statement."""
+
+# Precedences are compared as plain ints, which CPython specializes (unlike `IntEnum` members)
+_LOWEST = Precedence.LOWEST.value
+_PREFIX = Precedence.PREFIX.value
+
+_PRECEDENCES: list[int] = _by_token_type(
+    {
+        TokenType.EQUAL: Precedence.EQUALS.value,
+        TokenType.NOT_EQUAL: Precedence.EQUALS.value,
+        TokenType.LESSER_THAN: Precedence.LESSGREATER.value,
+        TokenType.GREATER_THAN: Precedence.LESSGREATER.value,
+        TokenType.PLUS: Precedence.SUM.value,
+        TokenType.MINUS: Precedence.SUM.value,
+        TokenType.SLASH: Precedence.PRODUCT.value,
+        TokenType.ASTERISK: Precedence.PRODUCT.value,
+        TokenType.LEFT_PAREN: Precedence.CALL.value,
+    },
+    _LOWEST,
+)
 
-        if self.next.type != t:
-            msg = f"Expected next token to be {t}, got {self.next.type}"
-            raise SyntaxError(msg)
 
-        self.advance()
+# Literal nodes are immutable and carry no position, so common ones are shared between all of
+# their occurrences instead of being allocated each time
+_SMALL_INTEGER_DIGITS = 3
+_small_integers: dict[str, IntegerLiteral] = {}
+"""Integer literals of at most `_SMALL_INTEGER_DIGITS` digits, by literal."""
 
+_booleans: dict[int, BooleanLiteral] = {}
+"""Boolean literals, by token type."""
 
-PrefixParseFn = Callable[[], Expression]
+PrefixParseFn = Callable[["Parser"], Expression]
 """A prefix parsing function produces a node when it matches a certain prefix."""
 
-InfixParseFn = Callable[[Expression], Expression]
+InfixParseFn = Callable[["Parser", Expression], Expression]
 """
 An infix parsing function produces a node when it matches in between two expressions.
 
@@ -111,268 +103,293 @@ consume the expression on the right.
 class Parser:
     "A Pratt parser for Monkey."
 
+    __slots__ = ("_current", "_next", "_next_token")
+
     def __init__(self, lexer: Generator[Token]) -> None:
-        self._tokens = TokenIterator(lexer)
-
-        self._prefix_parse_fns: dict[TokenType, PrefixParseFn] = {
-            TokenType.IDENTIFIER: self._parse_identifier,
-            TokenType.INTEGER: self._parse_integer_literal,
-            TokenType.TRUE: self._parse_boolean,
-            TokenType.FALSE: self._parse_boolean,
-            TokenType.STRING: self._parse_string_literal,
-            TokenType.LEFT_BRACKET: self._parse_array_literal,
-            TokenType.FUNCTION: self._parse_function_literal,
-            TokenType.BANG: self._parse_prefix_expression,
-            TokenType.MINUS: self._parse_prefix_expression,
-            TokenType.LEFT_PAREN: self._parse_grouped_expression,
-            TokenType.IF: self._parse_if_expression,
-        }
-
-        self._infix_parse_fns: dict[TokenType, InfixParseFn] = {
-            TokenType.EQUAL: self._parse_infix_expression,
-            TokenType.NOT_EQUAL: self._parse_infix_expression,
-            TokenType.LESSER_THAN: self._parse_infix_expression,
-            TokenType.GREATER_THAN: self._parse_infix_expression,
-            TokenType.PLUS: self._parse_infix_expression,
-            TokenType.MINUS: self._parse_infix_expression,
-            TokenType.SLASH: self._parse_infix_expression,
-            TokenType.ASTERISK: self._parse_infix_expression,
-            TokenType.LEFT_PAREN: self._parse_call_expression,
-        }
+        # The current token and the one after it (a.k.a. "peek token"). They live on the parser
+        # itself so that reading them does not go through another object.
+        self._next_token = lexer.__next__
+        self._current = self._next_token()
+        self._next = self._next_token()
+
+    def _advance(self) -> None:
+        "Advance by one token."
+        self._current = self._next
+        self._next = self._next_token()
+
+    def _expect_next(self, t: TokenType) -> None:
+        """
+        Expect the next token to be of the given type.
+
+        If it is, the parser will be advanced.
+        If it is not, a `SyntaxError` will be raised.
+        """
+
+        if self._next.type != t:
+            self._unexpected_next(t)
+
+        self._current = self._next
+        self._next = self._next_token()
+
+    def _unexpected_next(self, t: TokenType) -> NoReturn:
+        "Raise the `SyntaxError` for `_expect_next`, keeping it out of the happy path."
+        msg = f"Expected next token to be {t}, got {TokenType(self._next.type)}"
+        raise SyntaxError(msg)
 
     def parse_program(self) -> Program:
         program = Program([])
 
-        while not self._tokens.current_is(TokenType.END_OF_FILE):
+        while self._current.type != _END_OF_FILE:
             program.statements.append(self._parse_statement())
-            self._tokens.advance()
+            self._current = self._next
+            self._next = self._next_token()
 
         return program
 
     def _parse_statement(self) -> Statement:
-        match self._tokens.current.type:
-            case TokenType.LET:
-                return self._parse_let_statement()
-            case TokenType.RETURN:
-                return self._parse_return_statement()
-            case _:
-                return self._parse_expression_statement()
+        token_type = self._current.type
+        if token_type == _LET:
+            return self._parse_let_statement()
+        if token_type == _RETURN:
+            return self._parse_return_statement()
+        return self._parse_expression_statement()
 
     def _parse_let_statement(self) -> LetStatement:
         # let
-        token = self._tokens.current
+        token = self._current
 
         # let <name>
-        self._tokens.expect_next(TokenType.IDENTIFIER)
+        self._expect_next(TokenType.IDENTIFIER)
         name = self._parse_identifier()
 
         # let <name> =
-        self._tokens.expect_next(TokenType.ASSIGN)
-        self._tokens.advance()
+        self._expect_next(TokenType.ASSIGN)
+        self._advance()
 
         # let <name> = <value>
         value = self._parse_expression()
 
         # let <name> = value>;
-        self._tokens.expect_next(TokenType.SEMICOLON)
+        self._expect_next(TokenType.SEMICOLON)
 
         return LetStatement(token, name, value)
 
     def _parse_return_statement(self) -> ReturnStatement:
-        token = self._tokens.current
-        self._tokens.advance()
+        token = self._current
+        self._advance()
 
         # return <value>
         value = self._parse_expression()
 
         # return <value>;
-        self._tokens.expect_next(TokenType.SEMICOLON)
+        self._expect_next(TokenType.SEMICOLON)
 
         return ReturnStatement(token, value)
 
     def _parse_expression_statement(self) -> ExpressionStatement:
         expr = self._parse_expression()
 
-        if self._tokens.next_is(TokenType.SEMICOLON):
-            self._tokens.advance()
+        if self._next.type == _SEMICOLON:
+            self._advance()
 
-        return ExpressionStatement(self._tokens.current, expr)
+        return ExpressionStatement(self._current, expr)
 
-    def _parse_expression(self, precedence: Precedence = Precedence.LOWEST) -> Expression:
-        prefix_fn = self._prefix_parse_fns.get(self._tokens.current.type)
+    def _parse_expression(self, precedence: int = _LOWEST) -> Expression:
+        prefix_fn = self._prefix_parse_fns[self._current.type]
         if prefix_fn is None:
-            msg = f"No prefix parse function for {self._tokens.current.type}"
+            msg = f"No prefix parse function for {TokenType(self._current.type)}"
             raise SyntaxError(msg)
-        left = prefix_fn()
+        left = prefix_fn(self)
 
-        while (
-            self._tokens.next.type != TokenType.SEMICOLON and precedence < self._next_precedence()
-        ):
-            infix_fn = self._infix_parse_fns.get(self._tokens.next.type)
-            if infix_fn is None:
+        while True:
+            # Read the next token's type once per iteration
+            next_type = self._next.type
+            if next_type == _SEMICOLON or precedence >= _PRECEDENCES[next_type]:
                 return left
 
-            self._tokens.advance()
-            left = infix_fn(left)
+            infix_fn = self._infix_parse_fns[next_type]
+            if infix_fn is None:
+                return left
 
-        return left
+            self._current = self._next
+            self._next = self._next_token()
+            left = infix_fn(self, left)
 
     def _parse_if_expression(self) -> Expression:
         # if
-        token = self._tokens.current
+        token = self._current
 
         # if (
-        self._tokens.expect_next(TokenType.LEFT_PAREN)
-        self._tokens.advance()
+        self._expect_next(TokenType.LEFT_PAREN)
+        self._advance()
 
         # if (<condition>
         condition = self._parse_expression()
 
         # if (<condition>) {
-        self._tokens.expect_next(TokenType.RIGHT_PAREN)
-        self._tokens.expect_next(TokenType.LEFT_BRACE)
+        self._expect_next(TokenType.RIGHT_PAREN)
+        self._expect_next(TokenType.LEFT_BRACE)
 
         # if (<condition>) { <consequence> }
         consequence = self._parse_block_statement()
 
         # if (<condition>) { <consequence> } else { <alternative> }
         alternative = None
-        if self._tokens.next.type == TokenType.ELSE:
-            self._tokens.advance()
-            self._tokens.expect_next(TokenType.LEFT_BRACE)
+        if self._next.type == _ELSE:
+            self._advance()
+            self._expect_next(TokenType.LEFT_BRACE)
             alternative = self._parse_block_statement()
 
         return IfExpression(token, condition, consequence, alternative)
 
     def _parse_block_statement(self) -> BlockStatement:
-        token = self._tokens.current
+        token = self._current
 
-        self._tokens.advance()
+        self._advance()
 
         statements: list[Statement] = []
-        while self._tokens.current.type not in (TokenType.RIGHT_BRACE, TokenType.END_OF_FILE):
+        while self._current.type not in _BLOCK_END:
             statements.append(self._parse_statement())
-            self._tokens.advance()
+            self._current = self._next
+            self._next = self._next_token()
 
         return BlockStatement(token, statements)
 
     def _parse_prefix_expression(self) -> Expression:
-        token = self._tokens.current
+        token = self._current
         operator = token.literal
 
-        self._tokens.advance()
-        right = self._parse_expression(Precedence.PREFIX)
+        self._current = self._next
+        self._next = self._next_token()
+        right = self._parse_expression(_PREFIX)
 
         return PrefixExpression(token, operator, right)
 
     def _parse_infix_expression(self, left: Expression) -> Expression:
-        token = self._tokens.current
+        token = self._current
         operator = token.literal
 
-        precedence = self._current_precedence()
-        self._tokens.advance()
+        precedence = _PRECEDENCES[token.type]
+        self._current = self._next
+        self._next = self._next_token()
         right = self._parse_expression(precedence)
 
         return InfixExpression(token, left, operator, right)
 
     def _parse_grouped_expression(self) -> Expression:
-        self._tokens.advance()
+        self._advance()
         expr = self._parse_expression()
-        self._tokens.expect_next(TokenType.RIGHT_PAREN)
+        self._expect_next(TokenType.RIGHT_PAREN)
         return expr
 
     def _parse_function_literal(self) -> FunctionLiteral:
-        token = self._tokens.current
+        token = self._current
 
-        self._tokens.expect_next(TokenType.LEFT_PAREN)
-        params = self._parse_function_parameters()
+        self._expect_next(TokenType.LEFT_PAREN)
+        params = self._parse_list(self._parse_identifier, TokenType.RIGHT_PAREN)
 
-        self._tokens.expect_next(TokenType.LEFT_BRACE)
+        self._expect_next(TokenType.LEFT_BRACE)
         body = self._parse_block_statement()
 
         return FunctionLiteral(token, params, body)
 
-    def _parse_function_parameters(self) -> list[Identifier]:
-        params: list[Identifier] = []
-
-        if self._tokens.next.type == TokenType.RIGHT_PAREN:
-            self._tokens.advance()
-            return params
-
-        self._tokens.advance()
-
-        params.append(self._parse_identifier())
-
-        while self._tokens.next.type == TokenType.COMMA:
-            self._tokens.advance()
-            self._tokens.advance()
-            params.append(self._parse_identifier())
-
-        self._tokens.expect_next(TokenType.RIGHT_PAREN)
-
-        return params
-
     def _parse_string_literal(self) -> StringLiteral:
-        return StringLiteral(self._tokens.current, self._tokens.current.literal)
+        return StringLiteral(self._current, self._current.literal)
 
     def _parse_call_expression(self, fn: Expression) -> CallExpression:
-        if not isinstance(fn, Identifier | FunctionLiteral):
+        # Only identifiers and function literals can be called. Neither is subclassed, so
+        # comparing exact types is enough.
+        fn_type = type(fn)
+        if fn_type is not Identifier and fn_type is not FunctionLiteral:
             msg = "Expected identifier or function literal for function call"
             raise TypeError(msg)
 
-        token = self._tokens.current
-        args = self._parse_call_arguments()
-        return CallExpression(token, fn, args)
-
-    def _parse_call_arguments(self) -> list[Expression]:
-        args: list[Expression] = []
-
-        if self._tokens.next_is(TokenType.RIGHT_PAREN):
-            self._tokens.advance()
-            return args
-
-        self._tokens.advance()
+        token = self._current
+        args = self._parse_list(self._parse_expression, TokenType.RIGHT_PAREN)
+        return CallExpression(token, cast("Identifier | FunctionLiteral", fn), args)
 
-        args.append(self._parse_expression())
+    def _parse_list[T](self, parse_item: Callable[[], T], end: TokenType) -> list[T]:
+        """
+        Parse a comma-separated list of items, closed by `end`.
 
-        while self._tokens.next_is(TokenType.COMMA):
-            self._tokens.advance()
-            self._tokens.advance()
-            args.append(self._parse_expression())
+        The parser must be positioned on the opening delimiter. It is left on `end`.
+        """
 
-        self._tokens.expect_next(TokenType.RIGHT_PAREN)
+        items: list[T] = []
 
-        return args
+        if self._next.type == end:
+            self._advance()
+            return items
 
-    def _parse_array_literal(self) -> ArrayLiteral:
-        token = self._tokens.current
-        self._tokens.advance()  # Skip opening bracket
+        self._advance()
 
-        if self._tokens.current_is(TokenType.RIGHT_BRACKET):
-            return ArrayLiteral(token, [])
+        items.append(parse_item())
 
-        values: list[Expression] = [self._parse_expression()]
+        while self._next.type == _COMMA:
+            # Skip over the comma to the item after it
+            self._current = self._next_token()
+            self._next = self._next_token()
+            items.append(parse_item())
 
-        while self._tokens.next_is(TokenType.COMMA):
-            self._tokens.advance()
-            self._tokens.advance()
-            values.append(self._parse_expression())
+        self._expect_next(end)
 
-        self._tokens.expect_next(TokenType.RIGHT_BRACKET)
+        return items
 
+    def _parse_array_literal(self) -> ArrayLiteral:
+        token = self._current
+        values = self._parse_list(self._parse_expression, TokenType.RIGHT_BRACKET)
         return ArrayLiteral(token, values)
 
     def _parse_identifier(self) -> Identifier:
-        return Identifier(self._tokens.current, self._tokens.current.literal)
+        return Identifier(self._current, self._current.literal)
 
     def _parse_integer_literal(self) -> IntegerLiteral:
-        return IntegerLiteral(self._tokens.current, int(self._tokens.current.literal))
+        token = self._current
+        node = _small_integers.get(token.literal)
+        if node is None:
+            node = IntegerLiteral(token, int(token.literal))
+            if len(token.literal) <= _SMALL_INTEGER_DIGITS:
+                _small_integers[token.literal] = node
+        return node
 
     def _parse_boolean(self) -> BooleanLiteral:
-        return BooleanLiteral(self._tokens.current, self._tokens.current.type == TokenType.TRUE)
-
-    def _current_precedence(self) -> Precedence:
-        return _PRECEDENCES.get(self._tokens.current.type, Precedence.LOWEST)
-
-    def _next_precedence(self) -> Precedence:
-        return _PRECEDENCES.get(self._tokens.next.type, Precedence.LOWEST)
+        token = self._current
+        node = _booleans.get(token.type)
+        if node is None:
+            node = BooleanLiteral(token, token.type == _TRUE)
+            _booleans[token.type] = node
+        return node
+
+    # The parse function tables hold the plain functions, which take the parser as their first
+    # argument, so that they are built once for the class rather than for every parser
+    _prefix_parse_fns: ClassVar[list[PrefixParseFn | None]] = _by_token_type(
+        {
+            TokenType.IDENTIFIER: _parse_identifier,
+            TokenType.INTEGER: _parse_integer_literal,
+            TokenType.TRUE: _parse_boolean,
+            TokenType.FALSE: _parse_boolean,
+            TokenType.STRING: _parse_string_literal,
+            TokenType.LEFT_BRACKET: _parse_array_literal,
+            TokenType.FUNCTION: _parse_function_literal,
+            TokenType.BANG: _parse_prefix_expression,
+            TokenType.MINUS: _parse_prefix_expression,
+            TokenType.LEFT_PAREN: _parse_grouped_expression,
+            TokenType.IF: _parse_if_expression,
+        },
+        None,
+    )
+
+    _infix_parse_fns: ClassVar[list[InfixParseFn | None]] = _by_token_type(
+        {
+            TokenType.EQUAL: _parse_infix_expression,
+            TokenType.NOT_EQUAL: _parse_infix_expression,
+            TokenType.LESSER_THAN: _parse_infix_expression,
+            TokenType.GREATER_THAN: _parse_infix_expression,
+            TokenType.PLUS: _parse_infix_expression,
+            TokenType.MINUS: _parse_infix_expression,
+            TokenType.SLASH: _parse_infix_expression,
+            TokenType.ASTERISK: _parse_infix_expression,
+            TokenType.LEFT_PAREN: _parse_call_expression,
+        },
+        None,
+    )
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, final
+
+from monk.ast import (
+    ArrayLiteral,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    ExpressionStatement,
+    FunctionLiteral,
+    Identifier,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+)
+
+if TYPE_CHECKING:
+    from monk.ast import Node
+
+GLOBAL_DEPTH = -1
+"""The depth of identifiers that are looked up by name in the global scope."""
+
+
+@dataclass
+class _Scope:
+    slots: dict[str, int] = field(default_factory=dict)
+    pending: list[FunctionLiteral] = field(default_factory=list)
+
+
+@final
+class Resolver:
+    """
+    Statically resolves identifiers to slots, so that the evaluator can index into a list
+    instead of looking names up.
+
+    Every function gets its own scope. Parameters take the first slots, followed by each name
+    bound with `let` in the function body. An `Identifier` is annotated with the number of
+    functions to walk outwards (`depth`) and the `slot` in that function's scope. Names that are
+    not bound in any enclosing function are globals (or builtins) and keep `GLOBAL_DEPTH`. A name
+    is only bound once its `let` has run, so the addresses of the same name further out are kept
+    in `outer`, to be tried before the globals while the slot is unset.
+
+    Function bodies are resolved after the rest of the enclosing function, so that they can
+    refer to names (including their own) that are bound after the function literal itself.
+    """
+
+    def __init__(self) -> None:
+        self._scopes: list[_Scope] = []
+
+    def resolve(self, node: Node) -> None:  # noqa: C901, PLR0912
+        match node:
+            case Program() | BlockStatement():
+                for statement in node.statements:
+                    self.resolve(statement)
+
+            case ExpressionStatement():
+                self.resolve(node.expression)
+
+            case LetStatement():
+                self.resolve(node.value)
+                self._define(node.name)
+
+            case ReturnStatement():
+                self.resolve(node.value)
+
+            case Identifier():
+                self._resolve_identifier(node)
+
+            case ArrayLiteral():
+                for value in node.values:
+                    self.resolve(value)
+
+            case PrefixExpression():
+                self.resolve(node.right)
+
+            case InfixExpression():
+                self.resolve(node.left)
+                self.resolve(node.right)
+
+            case IfExpression():
+                self.resolve(node.condition)
+                self.resolve(node.consequence)
+                if node.alternative is not None:
+                    self.resolve(node.alternative)
+
+            case FunctionLiteral():
+                if self._scopes:
+                    self._scopes[-1].pending.append(node)
+                else:
+                    self._resolve_function(node)
+
+            case CallExpression():
+                self.resolve(node.function)
+                for argument in node.arguments:
+                    self.resolve(argument)
+
+            case IntegerLiteral() | StringLiteral() | BooleanLiteral():
+                pass
+
+            case _:
+                msg = f"Cannot resolve {type(node)}"
+                raise TypeError(msg)
+
+    def _resolve_function(self, node: FunctionLiteral) -> None:
+        scope = _Scope()
+        self._scopes.append(scope)
+
+        for param in node.parameters:
+            self._define(param)
+        self.resolve(node.body)
+
+        # Nested functions can see every name bound in this one
+        while scope.pending:
+            self._resolve_function(scope.pending.pop(0))
+
+        self._scopes.pop()
+        _annotate(node, num_slots=len(scope.slots))
+
+    def _define(self, name: Identifier) -> None:
+        if not self._scopes:
+            return
+
+        slots = self._scopes[-1].slots
+        slot = slots.setdefault(name.value, len(slots))
+        _annotate(name, depth=0, slot=slot)
+
+    def _resolve_identifier(self, node: Identifier) -> None:
+        addresses = [
+            (depth, slot)
+            for depth, scope in enumerate(reversed(self._scopes))
+            if (slot := scope.slots.get(node.value)) is not None
+        ]
+        if not addresses:
+            _annotate(node, depth=GLOBAL_DEPTH, slot=-1)
+            return
+
+        (depth, slot), *outer = addresses
+        _annotate(node, depth=depth, slot=slot)
+        if outer:
+            _annotate(node, outer=tuple(outer))
+
+
+def resolve(node: Node) -> None:
+    "Resolve the identifiers in `node`, treating it as top-level code."
+    Resolver().resolve(node)
+    if isinstance(node, Program):
+        _annotate(node, resolved=True)
+
+
+def _annotate(node: Node, **fields: object) -> None:
+    # AST nodes are frozen dataclasses, so bypass the frozen `__setattr__`
+    for name, value in fields.items():
+        object.__setattr__(node, name, value)
@@ -1,60 +1,111 @@
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum, auto
+from typing import override
 
 
-class TokenType(Enum):
-    ILLEGAL = "ILLEGAL"
-    END_OF_FILE = "END_OF_FILE"
+class TokenType(IntEnum):
+    """
+    The kind of a token.
 
-    IDENTIFIER = "IDENTIFIER"
-    INTEGER = "INTEGER"
-    STRING = "STRING"
+    Token types are small integers, so that the parser can look them up in lists instead of
+    hashing them. Tokens store the plain `int` value (see `Token`); the enum names them.
+    """
 
-    ASSIGN = "="
-    PLUS = "+"
-    MINUS = "-"
-    SLASH = "/"
-    ASTERISK = "*"
-    BANG = "!"
+    ILLEGAL = auto()
+    END_OF_FILE = auto()
 
-    COMMA = ","
-    SEMICOLON = ";"
+    IDENTIFIER = auto()
+    INTEGER = auto()
+    STRING = auto()
 
-    LEFT_PAREN = "("
-    RIGHT_PAREN = ")"
-    LEFT_BRACE = "{"
-    RIGHT_BRACE = "}"
-    LEFT_BRACKET = "["
-    RIGHT_BRACKET = "]"
+    ASSIGN = auto()
+    PLUS = auto()
+    MINUS = auto()
+    SLASH = auto()
+    ASTERISK = auto()
+    BANG = auto()
 
-    LESSER_THAN = "<"
-    GREATER_THAN = ">"
+    COMMA = auto()
+    SEMICOLON = auto()
 
-    EQUAL = "=="
-    NOT_EQUAL = "!="
+    LEFT_PAREN = auto()
+    RIGHT_PAREN = auto()
+    LEFT_BRACE = auto()
+    RIGHT_BRACE = auto()
+    LEFT_BRACKET = auto()
+    RIGHT_BRACKET = auto()
 
-    TRUE = "true"
-    FALSE = "false"
-    FUNCTION = "fn"
-    LET = "let"
-    IF = "if"
-    ELSE = "else"
-    RETURN = "return"
+    LESSER_THAN = auto()
+    GREATER_THAN = auto()
 
+    EQUAL = auto()
+    NOT_EQUAL = auto()
 
-@dataclass
+    TRUE = auto()
+    FALSE = auto()
+    FUNCTION = auto()
+    LET = auto()
+    IF = auto()
+    ELSE = auto()
+    RETURN = auto()
+
+    @override
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(slots=True)
 class Token:
-    type: TokenType
+    """
+    A token produced by the lexer.
+
+    `type` is a `TokenType` value. The lexer stores it as a plain `int`, since CPython only
+    specializes comparisons and list indexing for exact ints, and not for `IntEnum` members.
+
+    Tokens must never be changed once created: the lexer shares a single token for each
+    operator and keyword, and for the end of the input, between every program it lexes. The
+    class is not frozen because that makes every token slower to create.
+    """
+
+    type: int
     literal: str
 
+    @override
+    def __repr__(self) -> str:
+        return f"Token(type={TokenType(self.type).name}, literal={self.literal!r})"
+
+
+OPERATORS: dict[str, TokenType] = {
+    "=": TokenType.ASSIGN,
+    "+": TokenType.PLUS,
+    "-": TokenType.MINUS,
+    "/": TokenType.SLASH,
+    "*": TokenType.ASTERISK,
+    "!": TokenType.BANG,
+    ",": TokenType.COMMA,
+    ";": TokenType.SEMICOLON,
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    "[": TokenType.LEFT_BRACKET,
+    "]": TokenType.RIGHT_BRACKET,
+    "<": TokenType.LESSER_THAN,
+    ">": TokenType.GREATER_THAN,
+    "==": TokenType.EQUAL,
+    "!=": TokenType.NOT_EQUAL,
+}
+
+KEYWORDS: dict[str, TokenType] = {
+    "fn": TokenType.FUNCTION,
+    "let": TokenType.LET,
+    "true": TokenType.TRUE,
+    "false": TokenType.FALSE,
+    "if": TokenType.IF,
+    "else": TokenType.ELSE,
+    "return": TokenType.RETURN,
+}
+
 
 def lookup_ident(ident: str) -> TokenType:
-    return {
-        "fn": TokenType.FUNCTION,
-        "let": TokenType.LET,
-        "true": TokenType.TRUE,
-        "false": TokenType.FALSE,
-        "if": TokenType.IF,
-        "else": TokenType.ELSE,
-        "return": TokenType.RETURN,
-    }.get(ident, TokenType.IDENTIFIER)
+    return KEYWORDS.get(ident, TokenType.IDENTIFIER)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, cast
+from weakref import WeakValueDictionary
+
+from monk.ast import (
+    ArrayLiteral,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    Expression,
+    ExpressionStatement,
+    FunctionLiteral,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+)
+from monk.token import Token, TokenType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from monk.ast import Node, Statement
+
+_INTEGER_OPERATIONS: dict[str, Callable[[int, int], int | bool]] = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a // b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+_BOOLEAN_OPERATIONS: dict[str, Callable[[bool, bool], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+_literals: WeakValueDictionary[tuple[type, int | bool], Expression] = WeakValueDictionary()
+"""Folded literals, shared between identical subtrees."""
+
+
+def fold(node: Node) -> Node:  # noqa: C901, PLR0911, PLR0912
+    """
+    Fold constant subexpressions into literals.
+
+    Arithmetic and comparisons on integer literals, comparisons on boolean literals, negation
+    of literals and `if` expressions with a literal condition (whose taken branch is a single
+    expression) are replaced by their result. The input is left untouched; unchanged subtrees
+    are shared with the result.
+    """
+
+    match node:
+        case Program():
+            statements = _fold_statements(node.statements)
+            return node if statements is node.statements else Program(statements)
+
+        case BlockStatement():
+            statements = _fold_statements(node.statements)
+            return node if statements is node.statements else replace(node, statements=statements)
+
+        case ExpressionStatement():
+            expression = _fold_expression(node.expression)
+            return node if expression is node.expression else replace(node, expression=expression)
+
+        case LetStatement():
+            value = _fold_expression(node.value)
+            return node if value is node.value else replace(node, value=value)
+
+        case ReturnStatement():
+            value = _fold_expression(node.value)
+            return node if value is node.value else replace(node, value=value)
+
+        case PrefixExpression():
+            return _fold_prefix_expression(node)
+
+        case InfixExpression():
+            return _fold_infix_expression(node)
+
+        case IfExpression():
+            return _fold_if_expression(node)
+
+        case ArrayLiteral():
+            values = [_fold_expression(value) for value in node.values]
+            if all(a is b for a, b in zip(values, node.values, strict=True)):
+                return node
+            return replace(node, values=values)
+
+        case FunctionLiteral():
+            body = cast("BlockStatement", fold(node.body))
+            return node if body is node.body else replace(node, body=body)
+
+        case CallExpression():
+            arguments = [_fold_expression(argument) for argument in node.arguments]
+            if all(a is b for a, b in zip(arguments, node.arguments, strict=True)):
+                return node
+            return replace(node, arguments=arguments)
+
+        case _:
+            return node
+
+
+def _fold_expression(node: Expression) -> Expression:
+    return cast("Expression", fold(node))
+
+
+def _fold_statements(statements: list[Statement]) -> list[Statement]:
+    folded = [cast("Statement", fold(statement)) for statement in statements]
+    if all(a is b for a, b in zip(folded, statements, strict=True)):
+        return statements
+    return folded
+
+
+def _fold_prefix_expression(node: PrefixExpression) -> Expression:
+    right = _fold_expression(node.right)
+
+    if node.operator == "-" and isinstance(right, IntegerLiteral):
+        return _integer_literal(-right.value)
+    if node.operator == "!" and isinstance(right, BooleanLiteral):
+        return _boolean_literal(not right.value)
+
+    return node if right is node.right else replace(node, right=right)
+
+
+def _fold_infix_expression(node: InfixExpression) -> Expression:
+    left = _fold_expression(node.left)
+    right = _fold_expression(node.right)
+
+    if isinstance(left, IntegerLiteral) and isinstance(right, IntegerLiteral):
+        operation = _INTEGER_OPERATIONS.get(node.operator)
+        # Leave division by zero to fail at runtime
+        if operation is not None and not (node.operator == "/" and right.value == 0):
+            result = operation(left.value, right.value)
+            if isinstance(result, bool):
+                return _boolean_literal(result)
+            return _integer_literal(result)
+
+    if isinstance(left, BooleanLiteral) and isinstance(right, BooleanLiteral):
+        boolean_operation = _BOOLEAN_OPERATIONS.get(node.operator)
+        if boolean_operation is not None:
+            return _boolean_literal(boolean_operation(left.value, right.value))
+
+    if left is node.left and right is node.right:
+        return node
+    return replace(node, left=left, right=right)
+
+
+def _fold_if_expression(node: IfExpression) -> Expression:
+    condition = _fold_expression(node.condition)
+    consequence = cast("BlockStatement", fold(node.consequence))
+    alternative = None if node.alternative is None else fold(node.alternative)
+
+    if isinstance(condition, IntegerLiteral | StringLiteral | BooleanLiteral):
+        taken = consequence if condition.value is not False else alternative
+        if (
+            isinstance(taken, BlockStatement)
+            and len(taken.statements) == 1
+            and isinstance(taken.statements[0], ExpressionStatement)
+        ):
+            return taken.statements[0].expression
+
+    if (
+        condition is node.condition
+        and consequence is node.consequence
+        and alternative is node.alternative
+    ):
+        return node
+    return replace(
+        node,
+        condition=condition,
+        consequence=consequence,
+        alternative=cast("BlockStatement | None", alternative),
+    )
+
+
+def _integer_literal(value: int) -> Expression:
+    node = _literals.get((IntegerLiteral, value))
+    if node is None:
+        node = IntegerLiteral(Token(TokenType.INTEGER, str(value)), value)
+        _literals[IntegerLiteral, value] = node
+    return node
+
+
+def _boolean_literal(value: bool) -> Expression:  # noqa: FBT001
+    node = _literals.get((BooleanLiteral, value))
+    if node is None:
+        token_type = TokenType.TRUE if value else TokenType.FALSE
+        node = BooleanLiteral(Token(token_type, "true" if value else "false"), value)
+        _literals[BooleanLiteral, value] = node
+    return node
@@ -1,5 +1,5 @@
-from collections.abc import Sequence
+from collections.abc import Iterable
 
 
-def join_commas(xs: Sequence[object]) -> str:
-    return ", ".join(str(x) for x in xs)
+def join_commas(xs: Iterable[object]) -> str:
+    return ", ".join(map(str, xs))
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, final
+
+from monk.compiler import Opcode
+from monk.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+    builtins,
+    evaluate_bang_expression,
+    evaluate_infix_expression,
+    evaluate_prefix_expression,
+    is_truthy,
+    make_int,
+)
+from monk.object import Array, Builtin, Cell, Closure, CompiledFunction, Integer
+
+if TYPE_CHECKING:
+    from monk.compiler import Bytecode
+    from monk.object import Object
+
+STACK_SIZE = 2048
+"""
+Initial size of the operand stack. It grows when a call (or the main program) needs more room
+than is left, going by the `max_stack` the compiler worked out for each function.
+"""
+
+MAX_FRAMES = 1024
+"""Maximum call depth before a `RecursionError` is raised."""
+
+# Opcodes are compared as plain ints in the dispatch loop.
+_LOAD_CONST = Opcode.LOAD_CONST.value
+_LOAD_TRUE = Opcode.LOAD_TRUE.value
+_LOAD_FALSE = Opcode.LOAD_FALSE.value
+_LOAD_NULL = Opcode.LOAD_NULL.value
+_LOAD_GLOBAL = Opcode.LOAD_GLOBAL.value
+_STORE_GLOBAL = Opcode.STORE_GLOBAL.value
+_LOAD_LOCAL = Opcode.LOAD_LOCAL.value
+_STORE_LOCAL = Opcode.STORE_LOCAL.value
+_LOAD_FREE = Opcode.LOAD_FREE.value
+_POP = Opcode.POP.value
+_MAKE_CELL = Opcode.MAKE_CELL.value
+_LOAD_CELL = Opcode.LOAD_CELL.value
+_LOAD_FREE_CELL = Opcode.LOAD_FREE_CELL.value
+_LOAD_DEREF = Opcode.LOAD_DEREF.value
+_STORE_DEREF = Opcode.STORE_DEREF.value
+_ADD = Opcode.ADD.value
+_SUB = Opcode.SUB.value
+_MUL = Opcode.MUL.value
+_DIV = Opcode.DIV.value
+_EQUAL = Opcode.EQUAL.value
+_NOT_EQUAL = Opcode.NOT_EQUAL.value
+_LESSER_THAN = Opcode.LESSER_THAN.value
+_GREATER_THAN = Opcode.GREATER_THAN.value
+_MINUS = Opcode.MINUS.value
+_BANG = Opcode.BANG.value
+_JUMP = Opcode.JUMP.value
+_JUMP_IF_FALSE = Opcode.JUMP_IF_FALSE.value
+_BUILD_ARRAY = Opcode.BUILD_ARRAY.value
+_MAKE_CLOSURE = Opcode.MAKE_CLOSURE.value
+_CALL = Opcode.CALL.value
+_RETURN = Opcode.RETURN.value
+
+_OPERATORS: dict[int, str] = {
+    op: sys.intern(operator)
+    for op, operator in [
+        (_ADD, "+"),
+        (_SUB, "-"),
+        (_MUL, "*"),
+        (_DIV, "/"),
+        (_EQUAL, "=="),
+        (_NOT_EQUAL, "!="),
+        (_LESSER_THAN, "<"),
+        (_GREATER_THAN, ">"),
+    ]
+}
+
+
+@final
+class Frame:
+    "An activation record for a closure call."
+
+    __slots__ = ("base_pointer", "closure", "ip")
+
+    def __init__(self, closure: Closure, base_pointer: int) -> None:
+        self.closure = closure
+        self.base_pointer = base_pointer
+        self.ip = 0
+
+
+@final
+class VM:
+    """
+    A stack-based virtual machine that executes bytecode from `monk.compiler.Compiler`.
+
+    Passing in an existing globals list lets consecutive runs (as in the REPL) share state.
+
+    Globals and locals are `None` until their `let` has run, except that globals named after a
+    builtin start out as the builtin. Reading a local that is still unset
+    falls back to the same name in an enclosing function and then to the globals and builtins,
+    as in the evaluator; reading an unset global is a `NameError`.
+    """
+
+    def __init__(self, bytecode: Bytecode, globals_: list[Object | None] | None = None) -> None:
+        self.constants = bytecode.constants
+        self.globals = globals_ if globals_ is not None else []
+        self.globals.extend(
+            builtins.get(name) for name in bytecode.global_names[len(self.globals) :]
+        )
+        self._global_names = bytecode.global_names
+        self._global_indexes = {name: i for i, name in enumerate(bytecode.global_names)}
+
+        main = Closure(CompiledFunction(bytecode.instructions, max_stack=bytecode.max_stack), [])
+        self._frames = [Frame(main, 0)]
+        # Holds objects, with cells in the slots of captured locals and `None` in unset ones
+        self._stack: list[Any] = [None] * max(STACK_SIZE, bytecode.max_stack)
+
+    def run(self) -> Object:  # noqa: C901, PLR0912, PLR0915
+        "Run until the main program returns, and return its result."
+        constants = self.constants
+        globals_ = self.globals
+        frames = self._frames
+        stack = self._stack
+
+        frame = frames[-1]
+        closure = frame.closure
+        ins = closure.function.instructions
+        ip = frame.ip
+        bp = frame.base_pointer
+        sp = bp
+
+        # The stack is untyped, so pin down the type of what calls return
+        result: Object
+
+        while True:
+            op = ins[ip]
+            ip += 1
+
+            if op == _LOAD_CONST:
+                stack[sp] = constants[(ins[ip] << 8) | ins[ip + 1]]
+                sp += 1
+                ip += 2
+
+            elif op == _LOAD_LOCAL:
+                value = stack[bp + ins[ip]]
+                if value is None:
+                    value = self._unbound_local(closure, ins[ip])
+                stack[sp] = value
+                sp += 1
+                ip += 1
+
+            elif op == _STORE_LOCAL:
+                sp -= 1
+                stack[bp + ins[ip]] = stack[sp]
+                ip += 1
+
+            elif op == _LOAD_GLOBAL:
+                value = globals_[(ins[ip] << 8) | ins[ip + 1]]
+                if value is None:
+                    value = self._lookup_global(self._global_names[(ins[ip] << 8) | ins[ip + 1]])
+                stack[sp] = value
+                sp += 1
+                ip += 2
+
+            elif op == _STORE_GLOBAL:
+                sp -= 1
+                globals_[(ins[ip] << 8) | ins[ip + 1]] = stack[sp]
+                ip += 2
+
+            elif op == _POP:
+                sp -= 1
+
+            elif op in _OPERATORS:
+                sp -= 1
+                right = stack[sp]
+                left = stack[sp - 1]
+                stack[sp - 1] = self._binary_operation(op, left, right)
+
+            elif op == _JUMP_IF_FALSE:
+                sp -= 1
+                if is_truthy(stack[sp]):
+                    ip += 2
+                else:
+                    ip = (ins[ip] << 8) | ins[ip + 1]
+
+            elif op == _JUMP:
+                ip = (ins[ip] << 8) | ins[ip + 1]
+
+            elif op == _CALL:
+                num_args = ins[ip]
+                ip += 1
+                callee = stack[sp - 1 - num_args]
+
+                if type(callee) is Closure:
+                    function = callee.function
+                    num_params = function.num_parameters
+                    if num_args < num_params:
+                        # As in the evaluator, which runs out of arguments to bind
+                        msg = "list index out of range"
+                        raise IndexError(msg)
+                    if len(frames) >= MAX_FRAMES:
+                        msg = "Maximum call depth exceeded"
+                        raise RecursionError(msg)
+
+                    frame.ip = ip
+                    bp = sp - num_args
+                    frame = Frame(callee, bp)
+                    frames.append(frame)
+
+                    closure = callee
+                    ins = function.instructions
+                    ip = 0
+                    sp = bp + function.num_locals
+                    if sp + function.max_stack > len(stack):
+                        stack.extend([None] * max(len(stack), function.max_stack))
+                    if function.num_locals > num_params:
+                        # Left over from earlier calls or extra arguments, so unset them
+                        stack[bp + num_params : sp] = [None] * (function.num_locals - num_params)
+
+                elif type(callee) is Builtin:
+                    result = callee.function(*stack[sp - num_args : sp])
+                    sp -= num_args
+                    stack[sp - 1] = result
+
+                else:
+                    msg = f"Cannot call {callee.type}"
+                    raise TypeError(msg)
+
+            elif op == _RETURN:
+                result = stack[sp - 1]
+                frames.pop()
+                if not frames:
+                    return result
+
+                # Replace the callee with the result, dropping its arguments and locals
+                stack[bp - 1] = result
+                sp = bp
+
+                frame = frames[-1]
+                closure = frame.closure
+                ins = closure.function.instructions
+                ip = frame.ip
+                bp = frame.base_pointer
+
+            elif op == _LOAD_TRUE:
+                stack[sp] = TRUE
+                sp += 1
+
+            elif op == _LOAD_FALSE:
+                stack[sp] = FALSE
+                sp += 1
+
+            elif op == _LOAD_NULL:
+                stack[sp] = NULL
+                sp += 1
+
+            elif op == _LOAD_FREE:
+                value = closure.free[ins[ip]].value
+                if value is None:
+                    value = self._lookup_global(closure.function.free_names[ins[ip]])
+                stack[sp] = value
+                sp += 1
+                ip += 1
+
+            elif op == _LOAD_DEREF:
+                value = stack[bp + ins[ip]].value
+                if value is None:
+                    value = self._unbound_local(closure, ins[ip])
+                stack[sp] = value
+                sp += 1
+                ip += 1
+
+            elif op == _STORE_DEREF:
+                sp -= 1
+                stack[bp + ins[ip]].value = stack[sp]
+                ip += 1
+
+            elif op == _MAKE_CELL:
+                stack[bp + ins[ip]] = Cell(stack[bp + ins[ip]])
+                ip += 1
+
+            elif op == _LOAD_CELL:
+                stack[sp] = stack[bp + ins[ip]]
+                sp += 1
+                ip += 1
+
+            elif op == _LOAD_FREE_CELL:
+                stack[sp] = closure.free[ins[ip]]
+                sp += 1
+                ip += 1
+
+            elif op == _MINUS:
+                stack[sp - 1] = evaluate_prefix_expression("-", stack[sp - 1])
+
+            elif op == _BANG:
+                stack[sp - 1] = evaluate_bang_expression(stack[sp - 1])
+
+            elif op == _BUILD_ARRAY:
+                num_values = (ins[ip] << 8) | ins[ip + 1]
+                ip += 2
+                values = stack[sp - num_values : sp]
+                sp -= num_values
+                stack[sp] = Array(values)
+                sp += 1
+
+            elif op == _MAKE_CLOSURE:
+                constant = constants[(ins[ip] << 8) | ins[ip + 1]]
+                num_free = ins[ip + 2]
+                ip += 3
+                if type(constant) is not CompiledFunction:
+                    msg = f"Not a function: {constant.type}"
+                    raise TypeError(msg)
+
+                free = stack[sp - num_free : sp]
+                sp -= num_free
+                stack[sp] = Closure(constant, free)
+                sp += 1
+
+            else:
+                msg = f"Unknown opcode {op}"
+                raise RuntimeError(msg)
+
+    def _unbound_local(self, closure: Closure, slot: int) -> Object:
+        "Look up a local whose `let` has not run further out, where it is not shadowed yet."
+        function = closure.function
+        name = function.local_names[slot]
+        for cell, free_name in zip(closure.free, function.free_names, strict=True):
+            if free_name == name and cell.value is not None:
+                return cell.value
+        return self._lookup_global(name)
+
+    def _lookup_global(self, name: str) -> Object:
+        index = self._global_indexes.get(name)
+        if index is not None and (value := self.globals[index]) is not None:
+            return value
+        if (builtin := builtins.get(name)) is not None:
+            return builtin
+        msg = f"Unknown identifier {name}"
+        raise NameError(msg)
+
+    @staticmethod
+    def _binary_operation(op: int, left: Object, right: Object) -> Object:
+        if type(left) is Integer and type(right) is Integer:
+            lhs = left.value
+            rhs = right.value
+            if op == _ADD:
+                return make_int(lhs + rhs)
+            if op == _SUB:
+                return make_int(lhs - rhs)
+            if op == _MUL:
+                return make_int(lhs * rhs)
+            if op == _LESSER_THAN:
+                return TRUE if lhs < rhs else FALSE
+            if op == _GREATER_THAN:
+                return TRUE if lhs > rhs else FALSE
+
+        return evaluate_infix_expression(_OPERATORS[op], left, right)
@@ -11,3 +11,16 @@ def test_str() -> None:
     program = Program([let])
 
     assert str(program) == "let myVar = anotherVar;"
+
+
+def test_str_is_cached() -> None:
+    ident = Identifier(Token(TokenType.IDENTIFIER, "myVar"), "myVar")
+    program = Program([LetStatement(Token(TokenType.LET, "let"), ident, ident)])
+
+    first = str(program)
+    assert str(program) is first
+
+
+def test_nodes_have_no_instance_dict() -> None:
+    ident = Identifier(Token(TokenType.IDENTIFIER, "myVar"), "myVar")
+    assert not hasattr(ident, "__dict__")
@@ -0,0 +1,205 @@
+import pytest
+
+from monk.compiler import Compiler, Opcode, SymbolScope, SymbolTable, disassemble, make
+from monk.lexer import lex
+from monk.object import CompiledFunction, Integer, String
+from monk.parser import Parser
+
+
+def test_make() -> None:
+    assert make(Opcode.LOAD_CONST, 65534) == bytes([Opcode.LOAD_CONST, 255, 254])
+    assert make(Opcode.LOAD_LOCAL, 255) == bytes([Opcode.LOAD_LOCAL, 255])
+    assert make(Opcode.MAKE_CLOSURE, 65534, 255) == bytes([Opcode.MAKE_CLOSURE, 255, 254, 255])
+    assert make(Opcode.ADD) == bytes([Opcode.ADD])
+
+    with pytest.raises(SyntaxError, match="Too many local variables"):
+        _ = make(Opcode.LOAD_LOCAL, 256)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        (
+            "1 + 2",
+            """
+            0000 LOAD_CONST 0
+            0003 LOAD_CONST 1
+            0006 ADD
+            0007 RETURN
+            """,
+        ),
+        (
+            "1; 2",
+            """
+            0000 LOAD_CONST 0
+            0003 POP
+            0004 LOAD_CONST 1
+            0007 RETURN
+            """,
+        ),
+        (
+            "if (true) { 10 }; 3333;",
+            """
+            0000 LOAD_TRUE
+            0001 JUMP_IF_FALSE 10
+            0004 LOAD_CONST 0
+            0007 JUMP 11
+            0010 LOAD_NULL
+            0011 POP
+            0012 LOAD_CONST 1
+            0015 RETURN
+            """,
+        ),
+        (
+            "let one = 1; one;",
+            """
+            0000 LOAD_CONST 0
+            0003 STORE_GLOBAL 0
+            0006 LOAD_GLOBAL 0
+            0009 RETURN
+            """,
+        ),
+        (
+            "len([])",
+            """
+            0000 LOAD_GLOBAL 0
+            0003 BUILD_ARRAY 0
+            0006 CALL 1
+            0008 RETURN
+            """,
+        ),
+    ],
+)
+def test_instructions(code: str, expected: str) -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex(code)).parse_program())
+    assert disassemble(compiler.bytecode().instructions) == listing(expected)
+
+
+def test_closures() -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex("fn(a) { fn(b) { a + b } }")).parse_program())
+    bytecode = compiler.bytecode()
+
+    inner, outer = bytecode.constants
+    assert isinstance(inner, CompiledFunction)
+    assert isinstance(outer, CompiledFunction)
+    assert inner.num_parameters == 1
+
+    assert disassemble(inner.instructions) == listing(
+        """
+        0000 LOAD_FREE 0
+        0002 LOAD_LOCAL 0
+        0004 ADD
+        0005 RETURN
+        """,
+    )
+    assert disassemble(outer.instructions) == listing(
+        """
+        0000 MAKE_CELL 0
+        0002 LOAD_CELL 0
+        0004 MAKE_CLOSURE 0 1
+        0008 RETURN
+        """,
+    )
+
+
+def test_constants() -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex("1 + 2")).parse_program())
+    assert compiler.bytecode().constants == [Integer(1), Integer(2)]
+
+
+def test_constants_are_shared() -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex('1 + 1; "a" + "a"; 1')).parse_program())
+    assert compiler.bytecode().constants == [Integer(1), String("a")]
+
+    # Compiling more code into the same pool reuses its entries as well
+    compiler = Compiler(constants=compiler.constants)
+    compiler.compile(Parser(lex("1 + 2")).parse_program())
+    assert compiler.bytecode().constants == [Integer(1), String("a"), Integer(2)]
+
+
+@pytest.mark.parametrize(
+    ("code", "max_stack"),
+    [
+        ("", 1),
+        ("1 + 2 * 3", 3),
+        ("[1, 2, [3, 4]]", 4),
+        ("if (true) { 1 + 2 } else { 3 }", 2),
+        ("len([1, 2]); 3", 3),
+    ],
+)
+def test_max_stack(code: str, max_stack: int) -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex(code)).parse_program())
+    assert compiler.bytecode().max_stack == max_stack
+
+
+def test_limits() -> None:
+    lets = "".join(f"let a{i} = {i}; " for i in range(300))
+    with pytest.raises(SyntaxError, match="Too many local variables"):
+        Compiler().compile(Parser(lex(f"fn() {{ {lets} }}")).parse_program())
+
+    arguments = ", ".join(["1"] * 300)
+    with pytest.raises(SyntaxError, match="Too many arguments in one call"):
+        Compiler().compile(Parser(lex(f"len({arguments})")).parse_program())
+
+    statements = "1; " * 22_000
+    with pytest.raises(SyntaxError, match="Too much code in one function"):
+        Compiler().compile(Parser(lex(f"{statements} if (true) {{ 1 }}")).parse_program())
+
+
+def test_symbol_table() -> None:
+    global_table = SymbolTable()
+    a = global_table.define("a")
+    assert a.scope == SymbolScope.GLOBAL
+    assert global_table.define("a") == a
+
+    local_table = SymbolTable(global_table)
+    b = local_table.define("b")
+    assert b.scope == SymbolScope.LOCAL
+
+    nested_table = SymbolTable(local_table)
+    assert nested_table.resolve("a") == a
+    free = nested_table.resolve("b")
+    assert free is not None
+    assert free.scope == SymbolScope.FREE
+    assert nested_table.free_symbols == [b]
+
+    # Builtins are compiled as globals, which start out as the builtin
+    assert nested_table.resolve("len") is None
+    assert nested_table.resolve("unknown") is None
+
+
+def test_unknown_identifiers_are_globals() -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex("let f = fn() { x }; let x = 1;")).parse_program())
+    bytecode = compiler.bytecode()
+    # `x` is used before `f` is bound, so it gets the first slot
+    assert bytecode.global_names == ("x", "f")
+
+    f = bytecode.constants[0]
+    assert isinstance(f, CompiledFunction)
+    assert disassemble(f.instructions) == listing(
+        """
+        0000 LOAD_GLOBAL 0
+        0003 RETURN
+        """,
+    )
+
+
+def test_lets_are_declared_up_front() -> None:
+    compiler = Compiler()
+    compiler.compile(Parser(lex("fn(a) { let g = fn() { b }; let b = a; }")).parse_program())
+
+    g, f = compiler.bytecode().constants
+    assert isinstance(g, CompiledFunction)
+    assert isinstance(f, CompiledFunction)
+    assert f.local_names == ("a", "g", "b")
+    assert g.free_names == ("b",)
+
+
+def listing(text: str) -> str:
+    return "\n".join(line.strip() for line in text.strip().splitlines())
@@ -2,7 +2,7 @@ import re
 
 import pytest
 
-from monk.evaluator import NULL, evaluate
+from monk.evaluator import NULL, evaluate, make_int
 from monk.lexer import lex
 from monk.object import Array, Boolean, Environment, Function, Integer, Object, String
 from monk.parser import Parser
@@ -130,6 +130,7 @@ def test_if_exprs(code: str, expected_val: int | None) -> None:
             """,
             10,
         ),
+        ("let f = fn() { if (true) { return 1; } 2; }; f() + 10;", 11),
     ],
 )
 def test_return_statements(code: str, expected_val: int) -> None:
@@ -137,6 +138,13 @@ def test_return_statements(code: str, expected_val: int) -> None:
     assert_integer_obj(result, expected_val)
 
 
+def test_return_does_not_leak_into_next_program() -> None:
+    env = Environment()
+    _ = evaluate(Parser(lex("return 1; 2;")).parse_program(), env)
+    result = evaluate(Parser(lex("3; 4;")).parse_program(), env)
+    assert_integer_obj(result, 4)
+
+
 @pytest.mark.parametrize(
     ("code", "expected_msg"),
     [
@@ -217,6 +225,14 @@ def test_function_objects() -> None:
         ("let add = fn(x, y) { x + y; }; add(5, 5);", 10),
         ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
         ("fn(x) { x; }(5)", 5),
+        ("let adder = fn(a) { fn(b) { a + b } }; let add_two = adder(2); add_two(3);", 5),
+        ("let f = fn() { let g = fn() { h() }; let h = fn() { 5 }; g() }; f();", 5),
+        ("let x = 1; let f = fn() { let x = x + 1; x }; f() + x;", 3),
+        ("let x = 10; let f = fn(c) { if (c) { let x = 1; }; x }; f(false);", 10),
+        ("let x = 10; let f = fn(c) { if (c) { let x = 1; }; x }; f(true);", 1),
+        ("let f = fn(x) { fn(c) { if (c) { let x = 1; }; x } }; let g = f(7); g(false);", 7),
+        ("let f = fn() { len }; let len = 5; f();", 5),
+        ("let f = fn(x) { x }; f(1, 2, 3);", 1),
     ],
 )
 def test_function_application(code: str, expected_val: int) -> None:
@@ -224,6 +240,16 @@ def test_function_application(code: str, expected_val: int) -> None:
     assert_integer_obj(result, expected_val)
 
 
+def test_missing_arguments() -> None:
+    with pytest.raises(IndexError):
+        _ = do_eval("let f = fn(x) { x; }; f();")
+
+
+def test_unbound_local() -> None:
+    with pytest.raises(NameError, match="Unknown identifier x"):
+        _ = do_eval("let f = fn(c) { if (c) { let x = 1; }; x }; f(false);")
+
+
 def test_strings() -> None:
     result = do_eval('"hello world"')
     assert isinstance(result, String)
@@ -244,11 +270,18 @@ def test_string_concatenation() -> None:
         ('len("hello world")', 11),
         ("len(1)", "len takes a string or an array, got INTEGER"),
         ('len("one", "two")', "len takes 1 argument, got 2"),
+        ("len(rest(rest([1, 2, 3])))", 1),
+        ("first(rest([1, 2, 3]))", 2),
+        ("last(rest([1, 2, 3]))", 3),
+        ("first(rest([1]))", "first takes a non-empty array"),
     ],
 )
 def test_builtin_functions(code: str, expected_val: int | str) -> None:
     if isinstance(expected_val, str):
-        with pytest.raises((SyntaxError, TypeError, RuntimeError), match=re.escape(expected_val)):
+        with pytest.raises(
+            (SyntaxError, TypeError, RuntimeError, IndexError),
+            match=re.escape(expected_val),
+        ):
             _ = do_eval(code)
     else:
         result = do_eval(code)
@@ -261,6 +294,12 @@ def test_builtin_functions(code: str, expected_val: int | str) -> None:
         ("[1, 2, 3]", [1, 2, 3]),
         ("[]", []),
         ("[1]", [1]),
+        ("rest([1, 2, 3])", [2, 3]),
+        ("rest(rest(rest([1, 2, 3])))", []),
+        ("rest([])", []),
+        ("let a = [1, 2, 3]; let b = rest(a); push(b, 4); a", [1, 2, 3]),
+        ("let a = [1, 2, 3]; let b = rest(a); push(a, 4); b", [2, 3]),
+        ("let a = [1, 2, 3]; let b = rest(a); push(b, 4); b", [2, 3, 4]),
     ],
 )
 def test_arrays(code: str, expected_vals: list[int]) -> None:
@@ -283,6 +322,11 @@ def test_indexes(code: str, expected_val: int) -> None:
     assert_integer_obj(result, expected_val)
 
 
+def test_small_ints_are_shared() -> None:
+    assert do_eval("1 + 1") is make_int(2)
+    assert do_eval("1000 + 1") == Integer(1001)
+
+
 def assert_integer_obj(obj: Object, val: int) -> None:
     assert isinstance(obj, Integer)
     assert obj.value == val
@@ -1,5 +1,14 @@
+import sys
+from itertools import islice
+
+import pytest
+
+from monk.compiler import Compiler
 from monk.lexer import lex
-from monk.token import Token, TokenType
+from monk.parser import Parser
+from monk.resolver import resolve
+from monk.token import KEYWORDS, OPERATORS, Token, TokenType
+from monk.transform import fold
 
 
 def test_next_token() -> None:
@@ -136,8 +145,54 @@ def test_next_token() -> None:
         Token(TokenType.END_OF_FILE, ""),
     ]
 
-    lexer = lex(code)
+    actual_tokens = list(islice(lex(code), len(expected_tokens)))
+    assert actual_tokens == expected_tokens
+
+
+def test_illegal_character() -> None:
+    lexer = lex("let x = @;")
+
+    with pytest.raises(SyntaxError, match="Illegal character: @"):
+        _ = list(lexer)
+
+
+def test_operators_are_shared() -> None:
+    first = list(islice(lex("1 == 2"), 3))
+    second = list(islice(lex("3 == 4"), 3))
+    assert first[1] is second[1]
+    assert first[1].literal is sys.intern("==")
+
+
+def test_token_types_are_plain_ints() -> None:
+    tokens = list(islice(lex('let x = "a";'), 6))
+    assert all(type(token.type) is int for token in tokens)
+    assert repr(tokens[0]) == "Token(type=LET, literal='let')"
+
+
+def test_identifiers_are_interned() -> None:
+    first, second = islice(lex("foo foo"), 2)
+    assert first.literal is second.literal
+
+
+def test_trailing_whitespace() -> None:
+    # A long whitespace tail is consumed by a single match rather than rescanned from each of
+    # its characters, which used to make it quadratic
+    tokens = list(islice(lex("x" + " \n\t" * 100_000), 3))
+    assert [token.type for token in tokens] == [
+        TokenType.IDENTIFIER,
+        TokenType.END_OF_FILE,
+        TokenType.END_OF_FILE,
+    ]
+
+
+def test_shared_tokens_are_not_mutated() -> None:
+    code = 'let add = fn(x, y) { if (x == y) { [x] } else { x + y * "s" } }; !add(1, -2) != 3;'
+    program = fold(Parser(lex(code)).parse_program())
+    resolve(program)
+    Compiler().compile(program)
 
-    for i, expected_token in enumerate(expected_tokens):
-        actual_token = next(lexer)
-        assert expected_token == actual_token, f"Token #{i + 1} mismatch"
+    for literal, token_type in OPERATORS.items():
+        assert next(lex(literal)) == Token(token_type, literal)
+    for literal, token_type in KEYWORDS.items():
+        assert next(lex(literal)) == Token(token_type, literal)
+    assert next(lex("")) == Token(TokenType.END_OF_FILE, "")
@@ -272,3 +272,17 @@ def test_errors() -> None:
 
     with pytest.raises(SyntaxError):
         _ = parser.parse_program()
+
+
+def test_small_literals_are_shared() -> None:
+    program = parse_program("1 + 1; true == true; 1000 + 1000;")
+
+    exprs: list[InfixExpression] = []
+    for stmt in program.statements:
+        assert isinstance(stmt, ExpressionStatement)
+        assert isinstance(stmt.expression, InfixExpression)
+        exprs.append(stmt.expression)
+
+    assert exprs[0].left is exprs[0].right
+    assert exprs[1].left is exprs[1].right
+    assert exprs[2].left is not exprs[2].right
@@ -0,0 +1,63 @@
+from monk.ast import ExpressionStatement, FunctionLiteral, Identifier, InfixExpression, LetStatement
+from monk.lexer import lex
+from monk.parser import Parser
+from monk.resolver import GLOBAL_DEPTH, resolve
+
+
+def test_slots() -> None:
+    program = Parser(lex("let g = 1; fn(a, b) { let c = a; fn() { b + g } }")).parse_program()
+    resolve(program)
+    assert program.resolved
+
+    let = program.statements[0]
+    assert isinstance(let, LetStatement)
+    assert let.name.depth == GLOBAL_DEPTH
+
+    statement = program.statements[1]
+    assert isinstance(statement, ExpressionStatement)
+    outer = statement.expression
+    assert isinstance(outer, FunctionLiteral)
+    assert outer.num_slots == len(["a", "b", "c"])
+
+    let = outer.body.statements[0]
+    assert isinstance(let, LetStatement)
+    assert_address(let.name, 0, 2)
+    assert_address(let.value, 0, 0)
+
+    statement = outer.body.statements[1]
+    assert isinstance(statement, ExpressionStatement)
+    inner = statement.expression
+    assert isinstance(inner, FunctionLiteral)
+    assert inner.num_slots == 0
+
+    statement = inner.body.statements[0]
+    assert isinstance(statement, ExpressionStatement)
+    infix = statement.expression
+    assert isinstance(infix, InfixExpression)
+    assert_address(infix.left, 1, 1)
+    assert_address(infix.right, GLOBAL_DEPTH, -1)
+
+
+def test_later_bindings_are_visible_to_nested_functions() -> None:
+    program = Parser(lex("fn() { let f = fn() { f }; }")).parse_program()
+    resolve(program)
+
+    statement = program.statements[0]
+    assert isinstance(statement, ExpressionStatement)
+    outer = statement.expression
+    assert isinstance(outer, FunctionLiteral)
+
+    let = outer.body.statements[0]
+    assert isinstance(let, LetStatement)
+    inner = let.value
+    assert isinstance(inner, FunctionLiteral)
+
+    statement = inner.body.statements[0]
+    assert isinstance(statement, ExpressionStatement)
+    assert_address(statement.expression, 1, 0)
+
+
+def assert_address(expr: object, depth: int, slot: int) -> None:
+    assert isinstance(expr, Identifier)
+    assert expr.depth == depth
+    assert expr.slot == slot
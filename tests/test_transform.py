@@ -0,0 +1,51 @@
+import pytest
+
+from monk.ast import ExpressionStatement, FunctionLiteral, Program
+from monk.lexer import lex
+from monk.parser import Parser
+from monk.transform import fold
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("60 * 60 * 24;", "86400;"),
+        ("(5 + 10 * 2 + 15 / 3) * 2 + -10;", "50;"),
+        ("1 < 2;", "true;"),
+        ("(1 > 2) == false;", "true;"),
+        ("!true;", "false;"),
+        ("x + 2 * 3;", "(x + 6);"),
+        ("1 / 0;", "(1 / 0);"),
+        ("if (true) { 10 } else { 20 };", "10;"),
+        ("if (1 > 2) { 10 } else { x };", "x;"),
+        ("if (false) { 10 };", "if false {\n    10;\n};"),
+        ("f(1 + 1, [2 * 2]);", "f(2, [4]);"),
+    ],
+)
+def test_fold(code: str, expected: str) -> None:
+    program = fold(Parser(lex(code)).parse_program())
+    assert str(program) == expected
+
+
+def test_fold_function_bodies() -> None:
+    program = fold(Parser(lex("fn(x) { x * (2 + 2) };")).parse_program())
+    assert isinstance(program, Program)
+
+    statement = program.statements[0]
+    assert isinstance(statement, ExpressionStatement)
+    assert isinstance(statement.expression, FunctionLiteral)
+    assert str(statement.expression.body) == "{\n    (x * 4);\n}"
+
+
+def test_unchanged_subtrees_are_shared() -> None:
+    program = Parser(lex("let a = x + y; a * 2;")).parse_program()
+    assert fold(program) is program
+
+
+def test_literals_are_shared() -> None:
+    program = fold(Parser(lex("2 + 2; 1 + 3;")).parse_program())
+    assert isinstance(program, Program)
+    first, second = program.statements
+    assert isinstance(first, ExpressionStatement)
+    assert isinstance(second, ExpressionStatement)
+    assert first.expression is second.expression
@@ -0,0 +1,240 @@
+import re
+
+import pytest
+
+from monk.compiler import Compiler, SymbolTable
+from monk.evaluator import NULL
+from monk.lexer import lex
+from monk.object import Array, Boolean, Closure, Integer, Object, String
+from monk.parser import Parser
+from monk.vm import VM
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        ("5", 5),
+        ("-10", -10),
+        ("5 + 5 + 5 + 5 - 10", 10),
+        ("2 * 2 * 2 * 2 * 2", 32),
+        ("5 + 2 * 10", 25),
+        ("50 / 2 * 2 + 10", 60),
+        ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+    ],
+)
+def test_int_exprs(code: str, expected_val: int) -> None:
+    assert do_run(code) == Integer(expected_val)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        ("true", True),
+        ("1 < 2", True),
+        ("1 > 2", False),
+        ("1 == 1", True),
+        ("1 != 1", False),
+        ("true != false", True),
+        ("(1 < 2) == false", False),
+        ("!5", False),
+        ("!!true", True),
+    ],
+)
+def test_bool_exprs(code: str, expected_val: bool) -> None:
+    assert do_run(code) == Boolean(expected_val)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        ("if (true) { 10 }", 10),
+        ("if (false) { 10 }", None),
+        ("if (1 > 2) { 10 } else { 20 }", 20),
+        ("if (1 < 2) { let a = 10; }", None),
+        ("if ((if (false) { 10 })) { 10 } else { 20 }", 20),
+    ],
+)
+def test_if_exprs(code: str, expected_val: int | None) -> None:
+    result = do_run(code)
+    if expected_val is None:
+        assert result == NULL
+    else:
+        assert result == Integer(expected_val)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        ("return 10; 9;", 10),
+        ("9; return 2 * 5; 9;", 10),
+        ("if (10 > 1) { if (10 > 1) { return 10; } return 1; }", 10),
+        ("let a = 5; let b = a; let c = a + b + 5; c;", 15),
+        ("let a = 1; let a = a + 1; a;", 2),
+    ],
+)
+def test_statements(code: str, expected_val: int) -> None:
+    assert do_run(code) == Integer(expected_val)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        ("let identity = fn(x) { x; }; identity(5);", 5),
+        ("let identity = fn(x) { return x; }; identity(5);", 5),
+        ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
+        ("fn(x) { x; }(5)", 5),
+        ("let f = fn() { let a = 1; let b = 2; a + b }; f() + f();", 6),
+        ("let adder = fn(a) { fn(b) { a + b } }; let add_two = adder(2); add_two(3);", 5),
+        (
+            "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15);",
+            610,
+        ),
+        (
+            """
+            let wrapper = fn() {
+                let countdown = fn(x) { if (x == 0) { 0 } else { countdown(x - 1) } };
+                countdown(3);
+            };
+            wrapper();
+            """,
+            0,
+        ),
+        ('len("four")', 4),
+        ("len(rest([1, 2, 3]))", 2),
+    ],
+)
+def test_function_application(code: str, expected_val: int) -> None:
+    assert do_run(code) == Integer(expected_val)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_val"),
+    [
+        (
+            """
+            let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } };
+            let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } };
+            even(4);
+            """,
+            True,
+        ),
+        ("let f = fn() { x }; let x = 3; f();", 3),
+        ("let g = fn() { h() }; let h = fn() { 5 }; g();", 5),
+        ("let f = fn() { let g = fn() { h() }; let h = fn() { 5 }; g() }; f();", 5),
+        ("let f = fn() { unknown }; 1;", 1),
+        ("let f = fn() { let x = 1; let g = fn() { x }; let x = 2; g() }; f();", 2),
+        ("let x = 10; let f = fn(c) { if (c) { let x = 1; }; x }; f(false);", 10),
+        ("let f = fn(x) { fn(c) { if (c) { let x = 1; }; x } }; let g = f(7); g(false);", 7),
+        ("let x = 1; let f = fn() { let x = x + 1; x }; f() + x;", 3),
+        ("let f = fn() { len }; let len = 5; f();", 5),
+        ('let f = fn() { len("ab") }; f();', 2),
+        ("let f = fn(x) { x }; f(1, 2, 3);", 1),
+        ("let f = fn(x) { let y = 2; y }; f(1, 5);", 2),
+    ],
+)
+def test_bindings(code: str, expected_val: int | bool) -> None:
+    expected = Boolean(expected_val) if isinstance(expected_val, bool) else Integer(expected_val)
+    assert do_run(code) == expected
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "x;",
+        "let f = fn() { x }; f();",
+        # `x` must not pick up a value left on the stack by an earlier call
+        (
+            "let g = fn(a, b, c) { a }; g(1, 2, 3);"
+            "let f = fn(c) { if (c) { let x = 1; }; x }; f(false);"
+        ),
+        "if (false) { let y = 1; }; y;",
+    ],
+)
+def test_unbound_names(code: str) -> None:
+    with pytest.raises(NameError, match="Unknown identifier"):
+        _ = do_run(code)
+
+
+def test_missing_arguments() -> None:
+    with pytest.raises(IndexError):
+        _ = do_run("fn(x) { x }()")
+
+
+def test_closure_objects() -> None:
+    result = do_run("fn(x) { x + 2; }")
+    assert isinstance(result, Closure)
+    assert str(result).startswith("fn(x) ")
+    assert "(x + 2)" in str(result)
+
+
+def test_strings() -> None:
+    assert do_run('"hello" + " " + "world"') == String("hello world")
+
+
+def test_arrays() -> None:
+    assert do_run("[1, 2 * 2, 3 + 3]") == Array([Integer(1), Integer(4), Integer(6)])
+
+
+def test_stack_grows() -> None:
+    assert do_run(f"len([{', '.join(['1'] * 3000)}])") == Integer(3000)
+
+    # A call needs more room than the initial stack has left
+    code = f"let f = fn() {{ len([{', '.join(['1'] * 3000)}]) }}; f();"
+    assert do_run(code) == Integer(3000)
+
+
+def test_empty_program() -> None:
+    assert do_run("") == NULL
+
+
+def test_shared_globals() -> None:
+    compiler = Compiler()
+    globals_: list[Object | None] = []
+
+    compiler.compile(Parser(lex("let a = 5;")).parse_program())
+    _ = VM(compiler.bytecode(), globals_).run()
+
+    compiler = Compiler(compiler._symbols, compiler.constants)  # noqa: SLF001
+    compiler.compile(Parser(lex("a * 2")).parse_program())
+    assert VM(compiler.bytecode(), globals_).run() == Integer(10)
+
+
+def test_builtins_shadowed_in_later_runs() -> None:
+    symbols = SymbolTable()
+    constants: list[Object] = []
+    globals_: list[Object | None] = []
+
+    result: Object | None = None
+    for code in ["let f = fn() { len };", "let len = 5;", "f()"]:
+        compiler = Compiler(symbols, constants)
+        compiler.compile(Parser(lex(code)).parse_program())
+        result = VM(compiler.bytecode(), globals_).run()
+
+    assert result == Integer(5)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected_msg"),
+    [
+        ("5 + true;", "Type mismatch: INTEGER + BOOLEAN"),
+        ("-true", "Unknown operator: -BOOLEAN"),
+        ("5; true + false; 5", "Unknown operator: BOOLEAN + BOOLEAN"),
+        ('"hello" - "world"', "Unknown operator: STRING - STRING"),
+        ("len(1)", "len takes a string or an array, got INTEGER"),
+        ("let a = 1; a(2)", "Cannot call INTEGER"),
+    ],
+)
+def test_errors(code: str, expected_msg: str) -> None:
+    with pytest.raises((SyntaxError, TypeError), match=re.escape(expected_msg)):
+        _ = do_run(code)
+
+
+def test_recursion_limit() -> None:
+    with pytest.raises(RecursionError):
+        _ = do_run("let f = fn(x) { f(x) }; f(1);")
+
+
+def do_run(code: str) -> Object:
+    compiler = Compiler()
+    compiler.compile(Parser(lex(code)).parse_program())
+    return VM(compiler.bytecode()).run()